@@ -0,0 +1,85 @@
+import json
+import timeit
+
+from twitch.decoder import compile_decoder, loads
+from twitch.models import StreamsModel, VideosModel
+
+try:
+    from dacite import from_dict
+except ImportError:
+    from_dict = None
+
+
+def stream(index):
+    return {
+        "id": str(40000000000 + index),
+        "user_id": str(100000 + index),
+        "user_login": f"user{index}",
+        "user_name": f"User{index}",
+        "game_id": str(index % 50),
+        "game_name": f"Game {index % 50}",
+        "type": "live",
+        "title": f"Stream title number {index}",
+        "viewer_count": index * 7,
+        "started_at": "2021-03-10T15:04:21Z",
+        "language": "en",
+        "thumbnail_url": "https://static-cdn.jtvnw.net/previews-ttv/{width}x{height}.jpg",
+        "tag_ids": ["6ea6bca4-4712-4ab9-a906-e3336a9d8039"],
+        "is_mature": False,
+    }
+
+
+def video(index):
+    return {
+        "id": str(900000000 + index),
+        "stream_id": None,
+        "user_id": str(100000 + index),
+        "user_login": f"user{index}",
+        "user_name": f"User{index}",
+        "title": f"Video title number {index}",
+        "description": "",
+        "created_at": "2021-03-10T15:04:21Z",
+        "published_at": "2021-03-10T15:04:21Z",
+        "url": f"https://www.twitch.tv/videos/{900000000 + index}",
+        "thumbnail_url": "",
+        "viewable": "public",
+        "view_count": index,
+        "language": "en",
+        "type": "archive",
+        "duration": "3h8m33s",
+        "muted_segments": [{"duration": 30, "offset": 120}],
+    }
+
+
+def measure(label, func, number):
+    seconds = min(timeit.repeat(func, number=number, repeat=5)) / number
+    print(f"{label:<40} {seconds * 1e3:8.3f} ms/page")
+    return seconds
+
+
+if __name__ == "__main__":
+    number = 200
+    pages = (
+        (StreamsModel, [stream(index) for index in range(100)]),
+        (VideosModel, [video(index) for index in range(100)]),
+    )
+    for model, data in pages:
+        content = json.dumps({"data": data, "pagination": {"cursor": "abc"}}).encode()
+        decoder = compile_decoder(model)
+        print(f"{model.__name__}, 100 items, {len(content)} bytes")
+
+        fast = measure(
+            "loads + compiled decoder", lambda: decoder(loads(content)), number
+        )
+        measure(
+            "json.loads + compiled decoder",
+            lambda: decoder(json.loads(content)),
+            number,
+        )
+        if from_dict is not None:
+            slow = measure(
+                "json.loads + dacite.from_dict",
+                lambda: from_dict(model, json.loads(content)),
+                number,
+            )
+            print(f"{'speedup':<40} {slow / fast:8.1f}x")
@@ -0,0 +1,50 @@
+import os
+import tempfile
+
+from multiprocessing import Pool
+
+from twitch.cache import MemoryCache, SQLiteCache
+from twitch.client import TwitchAPIClient
+from twitch.transport import MemoryTransport
+
+GAME_IDS = [str(game_id) for game_id in range(2000)]
+
+
+def games(params):
+    data = [{"id": game_id, "name": f"Game {game_id}"} for game_id in params["id"]]
+    return {"data": data, "pagination": {}}
+
+
+class StubClient(TwitchAPIClient):
+    def _bearer_generator(self):
+        return "token", 3600
+
+
+def worker(arguments):
+    backend, path = arguments
+    cache = SQLiteCache(path) if backend == "sqlite" else MemoryCache()
+    transport = MemoryTransport()
+    transport.add("GET", "games", games)
+    client = StubClient(
+        "client_id",
+        "client_secret",
+        rate_limiter=None,
+        cache=cache,
+        transport=transport,
+    )
+
+    for start in range(0, len(GAME_IDS), 100):
+        client.get_games(id=GAME_IDS[start : start + 100])
+    return transport.calls
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "cache.sqlite3")
+        for backend in ("memory", "sqlite"):
+            with Pool(4) as pool:
+                cold = pool.map(worker, [(backend, path)] * 4)
+            with Pool(4) as pool:
+                warm = pool.map(worker, [(backend, path)] * 4)
+            print(f"{backend:<8} cold start requests per worker {cold}")
+            print(f"{backend:<8} warm start requests per worker {warm}")
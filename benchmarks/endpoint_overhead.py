@@ -0,0 +1,52 @@
+import json
+import timeit
+
+from twitch.client import TwitchAPIClient
+from twitch.metrics import Metrics
+from twitch.transport import MemoryTransport
+
+USERS = json.dumps({"data": [{"id": "141981764", "login": "twitchdev"}]})
+STREAMS = json.dumps({"data": [], "pagination": {}})
+
+
+class StubClient(TwitchAPIClient):
+    def _bearer_generator(self):
+        return "token", 3600
+
+
+def measure(label, func, number):
+    seconds = min(timeit.repeat(func, number=number, repeat=5))
+    print(f"{label:<40} {seconds / number * 1e6:8.2f} us/call")
+
+
+if __name__ == "__main__":
+    number = 20000
+    transport = MemoryTransport()
+    transport.add("GET", "users", USERS.encode())
+    transport.add("GET", "streams", STREAMS.encode())
+    for rate_limiter, retry_policy in ((None, None), (True, True)):
+        client = StubClient(
+            "client_id",
+            "client_secret",
+            rate_limiter=rate_limiter,
+            retry_policy=retry_policy,
+            transport=transport,
+        )
+        if rate_limiter:
+            client._rate_limiter.limit = client._rate_limiter.tokens = 10**9
+        print(f"rate_limiter={rate_limiter} retry_policy={retry_policy}")
+
+        spec = TwitchAPIClient.get_users.spec
+        kwargs = {"id": ["141981764", "171003792"]}
+        measure("validate get_users", lambda: spec.validate(kwargs), number)
+        measure("decode get_users", lambda: spec.decode(USERS), number)
+        measure("get_users (HTTP stubbed)", lambda: client.get_users(**kwargs), number)
+        measure(
+            "get_streams (HTTP stubbed)",
+            lambda: client.get_streams(first=100, language="en", after="cursor"),
+            number,
+        )
+
+    client.metrics = Metrics()
+    print("metrics=Metrics()")
+    measure("get_users (HTTP stubbed)", lambda: client.get_users(**kwargs), number)
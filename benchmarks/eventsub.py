@@ -0,0 +1,59 @@
+import json
+import time
+
+from datetime import datetime, timezone
+
+from twitch.eventsub import (
+    MESSAGE_ID,
+    MESSAGE_SIGNATURE,
+    MESSAGE_TIMESTAMP,
+    MESSAGE_TYPE,
+    EventSubReceiver,
+    sign,
+)
+
+SECRET = "benchmark-secret"
+
+
+def notification(index):
+    timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+    body = json.dumps(
+        {
+            "subscription": {"type": "stream.online", "version": "1"},
+            "event": {
+                "id": str(index),
+                "broadcaster_user_id": str(index),
+                "broadcaster_user_login": f"user{index}",
+                "broadcaster_user_name": f"User{index}",
+                "type": "live",
+                "started_at": timestamp,
+            },
+        }
+    ).encode()
+    headers = {
+        MESSAGE_ID: f"message-{index}",
+        MESSAGE_TIMESTAMP: timestamp,
+        MESSAGE_SIGNATURE: sign(SECRET, f"message-{index}", timestamp, body),
+        MESSAGE_TYPE: "notification",
+    }
+    return headers, body
+
+
+if __name__ == "__main__":
+    number = 100000
+    messages = [notification(index) for index in range(number)]
+    messages += messages[: number // 10]
+
+    receiver = EventSubReceiver(SECRET, queue_size=number)
+    online = []
+    receiver.on("stream.online")(online.append)
+
+    started = time.perf_counter()
+    for headers, body in messages:
+        receiver.process(headers, body)
+    receiver.join()
+    seconds = time.perf_counter() - started
+    receiver.stop()
+
+    print(f"{len(messages) / seconds:,.0f} messages/s ({len(online)} handled)")
+    print(receiver.stats)
@@ -0,0 +1,58 @@
+import gc
+import json
+import tracemalloc
+
+from twitch.compact import compact_model
+from twitch.decoder import compile_decoder, loads
+from twitch.models import StreamsModel
+
+LANGUAGES = ["en", "es", "de", "fr", "ja", "ko", "pt", "ru"]
+
+
+def page(number, size=100):
+    data = [
+        {
+            "id": str(40000000000 + number * size + index),
+            "user_id": str(100000 + number * size + index),
+            "user_login": f"user{number * size + index}",
+            "user_name": f"User{number * size + index}",
+            "game_id": str(index % 50),
+            "game_name": f"Game {index % 50}",
+            "type": "live",
+            "title": f"Stream title number {number * size + index}",
+            "viewer_count": index * 7,
+            "started_at": "2021-03-10T15:04:21Z",
+            "language": LANGUAGES[index % len(LANGUAGES)],
+            "thumbnail_url": f"https://static-cdn.jtvnw.net/{number}/{index}.jpg",
+            "tag_ids": ["6ea6bca4-4712-4ab9-a906-e3336a9d8039"],
+            "is_mature": False,
+        }
+        for index in range(size)
+    ]
+    return json.dumps({"data": data, "pagination": {"cursor": str(number)}}).encode()
+
+
+def snapshot_size(model, pages):
+    decoder = compile_decoder(model)
+    gc.collect()
+    tracemalloc.start()
+    snapshot = []
+    for content in pages:
+        snapshot.extend(decoder(loads(content)).data)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(snapshot), size
+
+
+if __name__ == "__main__":
+    pages = [page(number) for number in range(1000)]
+
+    for label, model in (
+        ("StreamsModel", StreamsModel),
+        ("compact StreamsModel", compact_model(StreamsModel)),
+        ("compact frozen StreamsModel", compact_model(StreamsModel, frozen=True)),
+    ):
+        count, size = snapshot_size(model, pages)
+        print(
+            f"{label:<30} {count} items {size / 2**20:8.1f} MiB {size / count:6.0f} B/item"
+        )
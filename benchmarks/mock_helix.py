@@ -0,0 +1,335 @@
+import json
+import random
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+LANGUAGES = ("en", "es", "de", "fr", "pt", "ru", "ja", "ko")
+
+
+def stream(index, games):
+    return {
+        "id": str(40000000000 + index),
+        "user_id": str(index),
+        "user_login": f"user{index}",
+        "user_name": f"User{index}",
+        "game_id": str(index % games),
+        "game_name": f"Game {index % games}",
+        "type": "live",
+        "title": f"Stream title number {index} with some words",
+        "viewer_count": 100000 // (index + 1),
+        "started_at": "2021-03-10T15:04:21Z",
+        "language": LANGUAGES[index % len(LANGUAGES)],
+        "thumbnail_url": f"https://static-cdn.jtvnw.net/previews-ttv/live_user_user{index}-{{width}}x{{height}}.jpg",
+        "tag_ids": ["6ea6bca4-4712-4ab9-a906-e3336a9d8039"],
+        "is_mature": index % 5 == 0,
+    }
+
+
+def user(index):
+    return {
+        "broadcaster_type": ("", "affiliate", "partner")[index % 3],
+        "description": f"Description of user {index}",
+        "display_name": f"User{index}",
+        "id": str(index),
+        "login": f"user{index}",
+        "offline_image_url": "",
+        "profile_image_url": f"https://static-cdn.jtvnw.net/user{index}-profile_image-300x300.png",
+        "type": "",
+        "view_count": index * 7,
+        "created_at": "2016-12-14T20:32:28Z",
+    }
+
+
+def video(index, user_id):
+    return {
+        "id": str(300000000 + index),
+        "stream_id": str(40000000000 + index),
+        "user_id": str(user_id),
+        "user_login": f"user{user_id}",
+        "user_name": f"User{user_id}",
+        "title": f"Video {index}",
+        "description": "",
+        "created_at": "2021-03-10T15:04:21Z",
+        "published_at": "2021-03-10T15:04:21Z",
+        "url": f"https://www.twitch.tv/videos/{300000000 + index}",
+        "thumbnail_url": "",
+        "viewable": "public",
+        "view_count": index,
+        "language": "en",
+        "type": "archive",
+        "duration": "3h8m33s",
+        "muted_segments": [{"duration": 30, "offset": 120}] if index % 4 == 0 else [],
+    }
+
+
+def clip(index, broadcaster_id, games):
+    return {
+        "id": f"AwkwardHelplessSalamander{index}",
+        "url": f"https://clips.twitch.tv/AwkwardHelplessSalamander{index}",
+        "embed_url": f"https://clips.twitch.tv/embed?clip=AwkwardHelplessSalamander{index}",
+        "broadcaster_id": str(broadcaster_id),
+        "broadcaster_name": f"User{broadcaster_id}",
+        "creator_id": str(index),
+        "creator_name": f"User{index}",
+        "video_id": "",
+        "game_id": str(index % games),
+        "language": "en",
+        "title": f"Clip {index}",
+        "view_count": index,
+        "created_at": "2021-03-10T15:04:21Z",
+        "thumbnail_url": "",
+        "duration": 29.9,
+    }
+
+
+def follow(index, to_id):
+    return {
+        "followed_at": "2021-03-10T15:04:21Z",
+        "from_id": str(index),
+        "from_login": f"user{index}",
+        "from_name": f"User{index}",
+        "to_id": str(to_id),
+        "to_login": f"user{to_id}",
+        "to_name": f"User{to_id}",
+    }
+
+
+class MockHelix:
+    def __init__(
+        self,
+        streams=10000,
+        users=1000000,
+        games=500,
+        videos=2000,
+        clips=2000,
+        follows=10000,
+        latency=0.0,
+        jitter=0.0,
+        error_rate=0.0,
+        throttle_rate=0.0,
+        limit=800,
+        period=60.0,
+        seed=0,
+    ):
+        self.streams = streams
+        self.users = users
+        self.games = games
+        self.videos = videos
+        self.clips = clips
+        self.follows = follows
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.limit = limit
+        self.period = period
+        self.requests = 0
+        self.statuses = {}
+        self._random = random.Random(seed)
+        self._tokens = float(limit)
+        self._updated = time.time()
+        self._lock = threading.Lock()
+        self._filtered = {}
+        self._server = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    @property
+    def url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def start(self):
+        mock = self
+
+        class Handler(MockHandler):
+            helix = mock
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self.url
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def client_class(self, base):
+        url = self.url
+
+        class MockClient(base):
+            _uri = f"{url}/helix/"
+            _auth_url = f"{url}/oauth2/token"
+
+        return MockClient
+
+    def _admit(self):
+        with self._lock:
+            self.requests += 1
+            now = time.time()
+            rate = self.limit / self.period
+            self._tokens = min(self.limit, self._tokens + (now - self._updated) * rate)
+            self._updated = now
+
+            roll = self._random.random()
+            if roll < self.error_rate:
+                return 503, []
+            if self._tokens < 1 or roll < self.error_rate + self.throttle_rate:
+                status = 429
+            else:
+                self._tokens -= 1
+                status = 200
+            reset = now + (self.limit - self._tokens) / rate
+            headers = [
+                ("Ratelimit-Limit", str(self.limit)),
+                ("Ratelimit-Remaining", str(int(self._tokens))),
+                ("Ratelimit-Reset", str(int(reset) + 1)),
+            ]
+            return status, headers
+
+    def stream_indices(self, games=None, languages=None):
+        if games is None and languages is None:
+            return range(self.streams)
+
+        key = (games, languages)
+        indices = self._filtered.get(key)
+        if indices is None:
+            indices = self._filtered[key] = [
+                index
+                for index in range(self.streams)
+                if (games is None or index % self.games in games)
+                and (
+                    languages is None or LANGUAGES[index % len(LANGUAGES)] in languages
+                )
+            ]
+        return indices
+
+    def _record(self, status):
+        with self._lock:
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+
+    def _delay(self):
+        if self.latency or self.jitter:
+            time.sleep(self.latency + self._random.random() * self.jitter)
+
+
+def _page(items, query, total):
+    first = int(query.get("first", ["20"])[0])
+    offset = int(query.get("after", ["0"])[0])
+    end = min(offset + first, total)
+    cursor = {"cursor": str(end)} if end < total else {}
+    return [items(index) for index in range(offset, end)], cursor
+
+
+class MockHandler(BaseHTTPRequestHandler):
+
+    helix = None
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body, headers=()):
+        content = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        for key, value in headers:
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(content)
+        self.helix._record(status)
+
+    def do_POST(self):
+        self.helix._delay()
+        if urlparse(self.path).path.endswith("oauth2/token"):
+            token = {
+                "access_token": "mock",
+                "expires_in": 5000000,
+                "token_type": "bearer",
+            }
+            return self._send(200, token)
+        self._send(404, {"error": "Not Found", "status": 404})
+
+    def do_GET(self):
+        helix = self.helix
+        helix._delay()
+        status, headers = helix._admit()
+        if status != 200:
+            message = {503: "Service Unavailable", 429: "Too Many Requests"}[status]
+            return self._send(status, {"error": message, "status": status}, headers)
+
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        route = url.path.rsplit("/helix/", 1)[-1]
+        handler = getattr(self, "_" + route.replace("/", "_"), None)
+        if handler is None:
+            return self._send(404, {"error": "Not Found", "status": 404}, headers)
+        self._send(200, handler(query), headers)
+
+    def _streams(self, query):
+        helix = self.helix
+        games = query.get("game_id")
+        languages = query.get("language")
+        indices = helix.stream_indices(
+            frozenset(int(game_id) for game_id in games) if games else None,
+            frozenset(languages) if languages else None,
+        )
+        data, cursor = _page(
+            lambda position: stream(indices[position], helix.games),
+            query,
+            len(indices),
+        )
+        return {"data": data, "pagination": cursor}
+
+    def _users(self, query):
+        ids = [int(value) for value in query.get("id", [])]
+        ids += [int(login[4:]) for login in query.get("login", [])]
+        return {"data": [user(index) for index in ids if 0 <= index < self.helix.users]}
+
+    def _videos(self, query):
+        if "id" in query:
+            return {"data": [video(int(value) - 300000000, 1) for value in query["id"]]}
+        user_id = int(query.get("user_id", ["1"])[0])
+        data, cursor = _page(
+            lambda index: video(index, user_id), query, self.helix.videos
+        )
+        return {"data": data, "pagination": cursor}
+
+    def _clips(self, query):
+        broadcaster_id = int(query.get("broadcaster_id", ["1"])[0])
+        helix = self.helix
+        data, cursor = _page(
+            lambda index: clip(index, broadcaster_id, helix.games), query, helix.clips
+        )
+        return {"data": data, "pagination": cursor}
+
+    def _games_top(self, query):
+        data, cursor = _page(
+            lambda index: {
+                "box_art_url": f"https://static-cdn.jtvnw.net/ttv-boxart/Game{index}-{{width}}x{{height}}.jpg",
+                "id": str(index),
+                "name": f"Game {index}",
+            },
+            query,
+            self.helix.games,
+        )
+        return {"data": data, "pagination": cursor}
+
+    def _users_follows(self, query):
+        to_id = int(query.get("to_id", query.get("from_id", ["1"]))[0])
+        data, cursor = _page(
+            lambda index: follow(index, to_id), query, self.helix.follows
+        )
+        return {"total": self.helix.follows, "data": data, "pagination": cursor}
@@ -0,0 +1,158 @@
+import argparse
+import multiprocessing
+import queue
+import resource
+import time
+
+from mock_helix import MockHelix
+
+from twitch.client import TwitchAPIClient
+from twitch.crawl import StreamCrawler
+from twitch.identity import IdentityResolver
+from twitch.metrics import Metrics
+from twitch.ratelimit import RateLimiter
+
+
+def streams_sweep(client, options):
+    return sum(1 for _ in client.iter_streams())
+
+
+def sharded_sweep(client, options):
+    crawler = StreamCrawler(client, max_workers=options.workers)
+    return sum(1 for _ in crawler.crawl())
+
+
+def resolve_users(client, options):
+    resolver = IdentityResolver(client)
+    found = resolver.resolve_ids(str(index) for index in range(options.users))
+    return sum(1 for identity in found.values() if identity is not None)
+
+
+def follower_backfill(client, options):
+    return sum(1 for _ in client.iter_users_follows(to_id="1"))
+
+
+SCENARIOS = {
+    "streams_sweep": streams_sweep,
+    "sharded_sweep": sharded_sweep,
+    "resolve_users": resolve_users,
+    "follower_backfill": follower_backfill,
+}
+
+
+def _percentile(values, q):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(int(q * len(values)), len(values) - 1)]
+
+
+def run(name, url, options, results):
+    class MockClient(TwitchAPIClient):
+        _uri = f"{url}/helix/"
+        _auth_url = f"{url}/oauth2/token"
+
+    latencies = []
+    metrics = Metrics()
+    metrics.add_response_hook(lambda sample: latencies.append(sample.total))
+    client = MockClient(
+        "client_id",
+        "client_secret",
+        rate_limiter=RateLimiter(options.limit, options.period),
+        metrics=metrics,
+        compact=options.compact,
+    )
+    client._bearer_token
+
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+    records = SCENARIOS[name](client, options)
+    elapsed = time.perf_counter() - started
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    results.put(
+        {
+            "scenario": name,
+            "calls": len(latencies),
+            "records": records,
+            "seconds": elapsed,
+            "p50": _percentile(latencies, 0.5),
+            "p99": _percentile(latencies, 0.99),
+            "peak_mib": (peak - baseline) / 1024,
+        }
+    )
+
+
+def _result(process, results):
+    while True:
+        try:
+            return results.get(timeout=1.0)
+        except queue.Empty:
+            if process.exitcode is not None:
+                try:
+                    return results.get(timeout=1.0)
+                except queue.Empty:
+                    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline client benchmarks")
+    parser.add_argument("scenarios", nargs="*", default=list(SCENARIOS))
+    parser.add_argument("--streams", type=int, default=20000)
+    parser.add_argument("--users", type=int, default=50000)
+    parser.add_argument("--follows", type=int, default=50000)
+    parser.add_argument("--games", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--limit", type=int, default=800)
+    parser.add_argument("--period", type=float, default=1.0)
+    parser.add_argument("--compact", action="store_true")
+    options = parser.parse_args()
+
+    mock = MockHelix(
+        streams=options.streams,
+        users=options.users,
+        games=options.games,
+        follows=options.follows,
+        latency=options.latency,
+        jitter=options.jitter,
+        error_rate=options.error_rate,
+        throttle_rate=options.throttle_rate,
+        limit=options.limit,
+        period=options.period,
+    )
+    context = multiprocessing.get_context("spawn")
+    print(
+        f"{'scenario':<20} {'calls':>8} {'requests':>8} {'records':>8} {'req/s':>9} "
+        f"{'records/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'peak MiB':>9}"
+    )
+    with mock:
+        for name in options.scenarios:
+            results = context.Queue()
+            process = context.Process(
+                target=run, args=(name, mock.url, options, results)
+            )
+            before = mock.requests
+            process.start()
+            result = _result(process, results)
+            process.join()
+            if result is None:
+                print(f"{name:<20} failed with exit code {process.exitcode}")
+                continue
+
+            requests = mock.requests - before
+            seconds = result["seconds"]
+            print(
+                f"{name:<20} {result['calls']:>8} {requests:>8} {result['records']:>8} "
+                f"{requests / seconds:>9.1f} {result['records'] / seconds:>10.0f} "
+                f"{result['p50'] * 1000:>8.2f} {result['p99'] * 1000:>8.2f} "
+                f"{result['peak_mib']:>9.1f}"
+            )
+    print(f"mock responses by status: {dict(sorted(mock.statuses.items()))}")
+
+
+if __name__ == "__main__":
+    main()
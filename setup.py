@@ -15,6 +15,12 @@ setup(
     url="https://github.com/helloracoon/py-twitch",
     packages=find_packages(),
     install_requires=requirements,
+    extras_require={
+        "async": ["aiohttp>=3.7"],
+        "speedups": ["orjson"],
+        "columnar": ["numpy"],
+        "http2": ["httpx[http2]"],
+    },
     long_description=long_description,
     long_description_content_type='text/markdown'
 )
@@ -1,5 +1,838 @@
+import asyncio
+import json
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+from twitch.aio import AsyncTwitchAPIClient
+from twitch.cache import MemoryCache, SingleFlight, SQLiteCache, cache_key
+from twitch.checkpoint import CheckpointStore
 from twitch.client import TwitchAPIClient
+from twitch.eventsub import EventSubReceiver, sign
+from twitch.exception import APIError, ValidationError
+from twitch.models import StreamsModel
+from twitch.ratelimit import BACKGROUND, INTERACTIVE, NORMAL, RateLimiter
+from twitch.retry import RetryPolicy
+from twitch.transport import MemoryTransport
+
+
+class EchoHandler(BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"
+
+    users = []
+    lock = threading.Lock()
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, body, status=200):
+        content = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def do_POST(self):
+        self._send({"access_token": "token", "expires_in": 3600})
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+
+        if url.path.endswith("/users"):
+            ids = query.get("id", [])
+            with self.lock:
+                EchoHandler.users.append(ids)
+            if "error" in ids:
+                return self._send({"error": "Bad Request", "status": 400}, 400)
+            users = [{"id": user_id, "login": f"login{user_id}"} for user_id in ids]
+            return self._send({"data": users})
+
+        after = query.get("after", [""])[0]
+        first = int(query.get("first", ["20"])[0])
+        streams = [
+            {"id": f"{after}:{index}", "language": query.get("language", [None])[0]}
+            for index in range(first)
+        ]
+        self._send({"data": streams, "pagination": {"cursor": f"{after}+"}})
+
+
+class ThreadIsolationTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), EchoHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+        base = f"http://127.0.0.1:{cls.server.server_port}"
+
+        class LocalClient(TwitchAPIClient):
+            _uri = f"{base}/helix/"
+            _auth_url = f"{base}/oauth2/token"
+
+        cls.client = LocalClient("client_id", "client_secret", rate_limiter=None)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def test_shared_client(self):
+        def call(index):
+            if index % 2:
+                ids = [str(index), str(index + 1)]
+                data = self.client.get_users(id=ids)
+                return [user.id for user in data.data] == ids
+
+            kwargs = {"first": index % 7 + 1}
+            if index % 4 == 0:
+                kwargs["after"] = f"cursor{index}"
+            if index % 3 == 0:
+                kwargs["language"] = "en"
+
+            data = self.client.get_streams(**kwargs)
+            return (
+                len(data.data) == kwargs["first"]
+                and data.pagination.cursor == f"{kwargs.get('after', '')}+"
+                and all(s.language == kwargs.get("language") for s in data.data)
+            )
+
+        with ThreadPoolExecutor(max_workers=64) as executor:
+            results = list(executor.map(call, range(2000)))
+
+        self.assertTrue(all(results))
+
+
+class TokenHandler(EchoHandler):
+
+    tokens = 0
+    revoked = set()
+    in_flight = peak = 0
+    lock = threading.Lock()
+
+    def do_POST(self):
+        with self.lock:
+            TokenHandler.tokens += 1
+            token = f"token{TokenHandler.tokens}"
+        self._send({"access_token": token, "expires_in": 3600})
+
+    def do_GET(self):
+        token = self.headers["Authorization"].split(" ", 1)[1]
+        if token in self.revoked:
+            return self._send({"error": "Unauthorized", "status": 401}, 401)
+        if urlparse(self.path).path.endswith("/games"):
+            return self._send({"error": "Service Unavailable", "status": 503}, 503)
+
+        with self.lock:
+            TokenHandler.in_flight += 1
+            TokenHandler.peak = max(TokenHandler.peak, TokenHandler.in_flight)
+        time.sleep(0.005)
+        try:
+            super().do_GET()
+        finally:
+            with self.lock:
+                TokenHandler.in_flight -= 1
+
+
+class AsyncClientTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), TokenHandler)
+        cls.server.daemon_threads = True
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+        base = f"http://127.0.0.1:{cls.server.server_port}"
+
+        class LocalClient(AsyncTwitchAPIClient):
+            _uri = f"{base}/helix/"
+            _auth_url = f"{base}/oauth2/token"
+
+        cls.client_class = LocalClient
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def run_client(self, test, **kwargs):
+        async def main():
+            async with self.client_class("client_id", "client_secret", **kwargs) as c:
+                return await test(c)
+
+        return asyncio.run(main())
+
+    def test_concurrency(self):
+        async def test(client):
+            ids = [[str(index), str(index + 1)] for index in range(200)]
+            pages = await asyncio.gather(*[client.get_users(id=i) for i in ids])
+            return [[user.id for user in page.data] for page in pages] == ids
+
+        TokenHandler.peak = 0
+        self.assertTrue(self.run_client(test, max_concurrency=8))
+        self.assertGreater(TokenHandler.peak, 1)
+        self.assertLessEqual(TokenHandler.peak, 8)
+
+    def test_validation(self):
+        async def test(client):
+            with self.assertRaises(ValidationError):
+                await client.get_users(id=123)
+            with self.assertRaises(ValidationError):
+                await client.get_streams_tags()
+            with self.assertRaises(ValidationError):
+                await client.get_streams(first=101)
+
+        self.run_client(test)
+
+    def test_error_status(self):
+        async def test(client):
+            with self.assertRaises(APIError):
+                await client.get_games(id="1")
+
+        self.run_client(test)
+
+    def test_unauthorized_replay(self):
+        async def test(client):
+            TokenHandler.revoked.add(client._bearer_token)
+            tokens = TokenHandler.tokens
+            pages = await asyncio.gather(
+                *[client.get_users(id=str(index)) for index in range(20)]
+            )
+            self.assertEqual(TokenHandler.tokens, tokens + 1)
+            return all(len(page.data) == 1 for page in pages)
+
+        self.assertTrue(self.run_client(test))
+
+    def test_token_expiry(self):
+        async def test(client):
+            token = client._bearer_token
+            client._expires_at = time.monotonic()
+            await client.get_users(id="1")
+            self.assertNotEqual(client._bearer_token, token)
+
+            token = client._bearer_token
+            client._refresh_at = time.monotonic()
+            await client.get_users(id="1")
+            await asyncio.sleep(0.1)
+            self.assertNotEqual(client._bearer_token, token)
+
+        self.run_client(test)
+
+
+class ClientTokenTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), TokenHandler)
+        cls.server.daemon_threads = True
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+        base = f"http://127.0.0.1:{cls.server.server_port}"
+
+        class LocalClient(TwitchAPIClient):
+            _uri = f"{base}/helix/"
+            _auth_url = f"{base}/oauth2/token"
+
+        cls.client_class = LocalClient
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def call_users(self, client, count):
+        def call(index):
+            return len(client.get_users(id=str(index)).data) == 1
+
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            return all(executor.map(call, range(count)))
+
+    def test_single_token_request(self):
+        tokens = TokenHandler.tokens
+        client = self.client_class("client_id", "client_secret", rate_limiter=None)
+        self.assertEqual(TokenHandler.tokens, tokens)
+
+        self.assertTrue(self.call_users(client, 64))
+        self.assertEqual(TokenHandler.tokens, tokens + 1)
+
+    def test_unauthorized_replay(self):
+        client = self.client_class("client_id", "client_secret", rate_limiter=None)
+        TokenHandler.revoked.add(client._bearer_token)
+        tokens = TokenHandler.tokens
+
+        self.assertTrue(self.call_users(client, 20))
+        self.assertEqual(TokenHandler.tokens, tokens + 1)
+
+    def test_token_without_expiry(self):
+        transport = MemoryTransport(record=True)
+        transport.add("POST", "oauth2/token", {"access_token": "token"})
+        transport.add("GET", "users", {"data": []})
+        client = TwitchAPIClient(
+            "client_id", "client_secret", rate_limiter=None, transport=transport
+        )
+        client.get_users(id="1")
+        client.get_users(id="2")
+        methods = [method for method, _, _ in transport.requests]
+        self.assertEqual(methods, ["POST", "GET", "GET"])
+
+
+def memory_client(handler, **kwargs):
+    def route(method, url, params):
+        if url.endswith("oauth2/token"):
+            return 200, {"access_token": "token"}
+        return handler(method, url, params)
+
+    transport = MemoryTransport(route)
+    return TwitchAPIClient("client_id", "client_secret", transport=transport, **kwargs)
+
+
+class RateLimiterTest(unittest.TestCase):
+    def test_header_sync(self):
+        headers = {"Ratelimit-Limit": "120", "Ratelimit-Remaining": "3"}
+        limiter = RateLimiter()
+        client = memory_client(
+            lambda *args: (200, {"data": []}, headers), rate_limiter=limiter
+        )
+        client.get_users(id="1")
+        self.assertEqual(limiter.limit, 120)
+        self.assertLessEqual(limiter.tokens, 3)
+
+    def test_unsynced_requests_run_concurrently(self):
+        lock = threading.Lock()
+        state = {"in_flight": 0, "peak": 0}
+
+        def handler(method, url, params):
+            with lock:
+                state["in_flight"] += 1
+                state["peak"] = max(state["peak"], state["in_flight"])
+            time.sleep(0.02)
+            with lock:
+                state["in_flight"] -= 1
+            return 200, {"data": []}
+
+        client = memory_client(handler, rate_limiter=RateLimiter())
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda i: client.get_users(id=str(i)), range(16)))
+        self.assertGreater(state["peak"], 1)
+
+    def test_too_many_requests_replay(self):
+        calls = []
+
+        def handler(method, url, params):
+            calls.append(time.monotonic())
+            if len(calls) == 1:
+                reset = str(time.time() + 0.2)
+                return 429, {"status": 429}, {"Ratelimit-Reset": reset}
+            return 200, {"data": [{"id": "1"}]}
+
+        client = memory_client(handler, rate_limiter=RateLimiter())
+        self.assertEqual(client.get_users(id="1").data[0].id, "1")
+        self.assertEqual(len(calls), 2)
+        self.assertGreaterEqual(calls[1] - calls[0], 0.15)
+
+    def test_replays_exhausted(self):
+        calls = []
+
+        def handler(method, url, params):
+            calls.append(url)
+            return 429, {"status": 429}, {"Ratelimit-Reset": str(time.time())}
+
+        client = memory_client(handler, rate_limiter=RateLimiter(max_replays=2))
+        with self.assertRaises(APIError):
+            client.get_users(id="1")
+        self.assertEqual(len(calls), 3)
+
+    def test_priority_order(self):
+        order = []
+        limiter = RateLimiter(limit=10, period=1.0)
+        client = memory_client(
+            lambda method, url, params: order.append(params["id"])
+            or (200, {"data": []}),
+            rate_limiter=limiter,
+        )
+        client.get_users(id="warmup")
+        limiter.tokens = 0
+
+        def call(priority):
+            with client.priority(priority):
+                client.get_users(id=str(priority))
+
+        threads = []
+        for priority in (BACKGROUND, NORMAL, INTERACTIVE):
+            threads.append(threading.Thread(target=call, args=(priority,)))
+            threads[-1].start()
+            time.sleep(0.02)
+        for thread in threads:
+            thread.join()
+        self.assertEqual(order[1:], [str(INTERACTIVE), str(NORMAL), str(BACKGROUND)])
+
+
+class RetryTest(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+        self.hooks = []
+
+    def client(self, responses, **kwargs):
+        def handler(method, url, params):
+            self.calls.append(method)
+            result = responses[min(len(self.calls), len(responses)) - 1]
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        policy = RetryPolicy(
+            backoff=0.001, hook=lambda **event: self.hooks.append(event), **kwargs
+        )
+        return memory_client(handler, rate_limiter=None, retry_policy=policy)
+
+    def test_server_error(self):
+        client = self.client(
+            [(503, {"status": 503}), (200, {"data": [], "pagination": {}})]
+        )
+        client.get_games(id="1")
+        self.assertEqual(len(self.calls), 2)
+        self.assertEqual(len(self.hooks), 1)
+        hook = self.hooks[0]
+        self.assertEqual((hook["path"], hook["method"]), ("games", "GET"))
+        self.assertEqual((hook["attempt"], hook["status_code"]), (1, 503))
+        self.assertIsNone(hook["error"])
+        self.assertLessEqual(hook["delay"], 0.001)
+
+    def test_retries_exhausted(self):
+        client = self.client([(502, {"status": 502})], retries=3)
+        with self.assertRaises(APIError):
+            client.get_games(id="1")
+        self.assertEqual(len(self.calls), 4)
+        self.assertEqual([hook["attempt"] for hook in self.hooks], [1, 2, 3])
+
+    def test_client_error(self):
+        client = self.client([(404, {"status": 404})])
+        with self.assertRaises(APIError):
+            client.get_games(id="1")
+        self.assertEqual(len(self.calls), 1)
+
+    def test_connection_error(self):
+        error = requests.ConnectionError("reset")
+        client = self.client([error, error, (200, {"data": [], "pagination": {}})])
+        client.get_games(id="1")
+        self.assertEqual(len(self.calls), 3)
+        self.assertEqual([hook["error"] for hook in self.hooks], [error, error])
+        self.assertIsNone(self.hooks[0]["status_code"])
+
+    def test_timeout(self):
+        client = self.client([requests.Timeout("read")], retries=2)
+        with self.assertRaises(requests.Timeout):
+            client.get_games(id="1")
+        self.assertEqual(len(self.calls), 3)
+
+    def test_post_not_retried(self):
+        client = self.client([(503, {"status": 503})])
+        with self.assertRaises(APIError):
+            client.post_eventsub_subscriptions(
+                type="stream.online", version="1", condition={}, transport={}
+            )
+        self.assertEqual(self.calls, ["POST"])
+        self.assertEqual(self.hooks, [])
+
+    def test_max_elapsed(self):
+        def slow(method, url, params):
+            self.calls.append(method)
+            time.sleep(0.03)
+            return 503, {"status": 503}
+
+        policy = RetryPolicy(backoff=0.001, retries=10, max_elapsed=0.05)
+        client = memory_client(slow, rate_limiter=None, retry_policy=policy)
+        with self.assertRaises(APIError):
+            client.get_games(id="1")
+        self.assertEqual(len(self.calls), 2)
+
+
+class CacheTest(unittest.TestCase):
+    def test_ttl(self):
+        cache = MemoryCache()
+        cache.set("key", b"value", 0.05)
+        self.assertEqual(cache.get("key"), b"value")
+        time.sleep(0.06)
+        self.assertIsNone(cache.get("key"))
+        self.assertEqual(len(cache), 0)
+
+    def test_lru_eviction(self):
+        cache = MemoryCache(maxsize=2)
+        cache.set("a", b"a", 60)
+        cache.set("b", b"b", 60)
+        cache.get("a")
+        cache.set("c", b"c", 60)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual((cache.get("a"), cache.get("c")), (b"a", b"c"))
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_max_bytes(self):
+        cache = MemoryCache(max_bytes=10)
+        cache.set("a", b"aaaaaa", 60)
+        cache.set("b", b"bbbbbb", 60)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("b"), b"bbbbbb")
+        self.assertEqual(cache.stats()["bytes"], 6)
+
+    def test_key_normalization(self):
+        spec = TwitchAPIClient.get_users.spec
+        self.assertEqual(
+            cache_key(spec, {"id": ["2", "1"], "login": None}),
+            cache_key(spec, {"id": ["1", "2"]}),
+        )
+        self.assertNotEqual(
+            cache_key(spec, {"id": ["1"]}), cache_key(spec, {"login": ["1"]})
+        )
+
+    def test_single_flight(self):
+        calls = []
+
+        def handler(method, url, params):
+            calls.append(url)
+            time.sleep(0.05)
+            return 200, {"data": [{"id": "1"}]}
+
+        client = memory_client(handler, rate_limiter=None, cache=True)
+        barrier = threading.Barrier(16)
+
+        def call(_):
+            barrier.wait()
+            return client.get_users(id="1").data[0].id
+
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            self.assertEqual(set(executor.map(call, range(16))), {"1"})
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(client.get_users(id="1").data[0].id, "1")
+        self.assertEqual(len(calls), 1)
+
+    def test_single_flight_error(self):
+        flight = SingleFlight()
+        with self.assertRaises(KeyError):
+            flight.do("key", lambda: {}["missing"])
+        self.assertEqual(flight.do("key", lambda: 1), 1)
+
+
+class SQLiteCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "cache.db")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_shared_path(self):
+        first, second = SQLiteCache(self.path), SQLiteCache(self.path)
+        first.set("key", b"value", 60)
+        self.assertEqual(second.get("key"), b"value")
+
+        script = (
+            "import sys; from twitch.cache import SQLiteCache; "
+            "cache = SQLiteCache(sys.argv[1]); "
+            "print(cache.get('key').decode()); cache.set('child', b'child', 60)"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", script, self.path],
+            capture_output=True,
+            check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout
+        self.assertEqual(output.strip(), b"value")
+        self.assertEqual(first.get("child"), b"child")
+
+    def test_ttl(self):
+        cache = SQLiteCache(self.path)
+        cache.set("key", b"value", 0.05)
+        self.assertEqual(cache.get("key"), b"value")
+        time.sleep(0.06)
+        self.assertIsNone(cache.get("key"))
+        cache.purge()
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_restart(self):
+        cache = SQLiteCache(self.path)
+        cache.set("key", b"value", 60)
+        del cache
+
+        cache = SQLiteCache(self.path)
+        self.assertEqual(cache.get("key"), b"value")
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(len(cache), 1)
+
+
+class CheckpointTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = CheckpointStore(os.path.join(self.directory.name, "crawl.db"))
+        self.requests = []
+
+        def handler(method, url, params):
+            self.requests.append(params.get("after"))
+            page = int(params.get("after") or 0)
+            data = [{"id": str(page * 3 + index)} for index in range(3)]
+            cursor = {"cursor": str(page + 1)} if page < 2 else {}
+            return 200, {"data": data, "pagination": cursor}
+
+        self.client = memory_client(handler, rate_limiter=None)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_resume(self):
+        streams = self.client.iter_streams(first=3, checkpoint=self.store)
+        first = [next(streams).id for _ in range(4)]
+        streams.close()
+        self.assertEqual(first, ["0", "1", "2", "3"])
+
+        (key,) = self.store.keys()
+        checkpoint = self.store.load(key)
+        self.assertEqual((checkpoint["cursor"], checkpoint["emitted"]), ("1", 3))
+
+        rest = [s.id for s in self.client.iter_streams(first=3, checkpoint=self.store)]
+        self.assertEqual(rest, ["3", "4", "5", "6", "7", "8"])
+        self.assertEqual(self.requests, [None, "1", "1", "2"])
+        self.assertEqual(self.store.keys(), [])
+
+
+class BatchTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), EchoHandler)
+        cls.server.daemon_threads = True
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+        base = f"http://127.0.0.1:{cls.server.server_port}"
+
+        class LocalClient(TwitchAPIClient):
+            _uri = f"{base}/helix/"
+            _auth_url = f"{base}/oauth2/token"
+
+        cls.client_class = LocalClient
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        EchoHandler.users = []
+
+    def coalesce(self, ids, window):
+        client = self.client_class(
+            "client_id", "client_secret", rate_limiter=None, coalesce_window=window
+        )
+        barrier = threading.Barrier(len(ids))
+
+        def call(user_id):
+            barrier.wait()
+            try:
+                return [user.id for user in client.get_users(id=user_id).data]
+            except APIError as error:
+                return error
+
+        with ThreadPoolExecutor(max_workers=len(ids)) as executor:
+            return list(executor.map(call, ids))
+
+    def test_coalesce(self):
+        ids = [str(index) for index in range(20)] + ["3", "7"]
+        results = self.coalesce(ids, window=0.2)
+        self.assertEqual(results, [[user_id] for user_id in ids])
+        self.assertEqual(len(EchoHandler.users), 1)
+        self.assertEqual(sorted(EchoHandler.users[0]), sorted(set(ids)))
+
+    def test_coalesce_full_batch(self):
+        ids = [str(index) for index in range(100)]
+        started = time.monotonic()
+        results = self.coalesce(ids, window=5.0)
+        self.assertLess(time.monotonic() - started, 2.5)
+        self.assertEqual(results, [[user_id] for user_id in ids])
+        self.assertEqual(len(EchoHandler.users), 1)
+
+    def test_coalesce_error(self):
+        results = self.coalesce(["1", "2", "error"], window=0.2)
+        self.assertEqual(len(EchoHandler.users), 1)
+        self.assertTrue(all(isinstance(result, APIError) for result in results))
+
+    def test_bulk(self):
+        client = self.client_class("client_id", "client_secret", rate_limiter=None)
+        ids = [str(index) for index in reversed(range(250))]
+        ids[10:10] = ["3", "200", "3"]
+        unique = list(dict.fromkeys(ids))
+
+        users = client.bulk_get_users(id=ids, max_workers=3)
+        self.assertEqual([user.id for user in users.data], unique)
+        self.assertEqual(
+            sorted(len(chunk) for chunk in EchoHandler.users), [50, 100, 100]
+        )
+        self.assertEqual(sorted(sum(EchoHandler.users, [])), sorted(unique))
+
+        users = client.iter_bulk(client.get_users, id=iter(ids))
+        self.assertEqual([user.id for user in users], unique)
+
+    def test_bulk_empty(self):
+        client = self.client_class("client_id", "client_secret", rate_limiter=None)
+        self.assertEqual(client.bulk_get_users(id=[]).data, [])
+        self.assertEqual(list(client.iter_bulk(client.get_users, id=[])), [])
+        self.assertEqual(EchoHandler.users, [])
+
+
+class PickleTest(unittest.TestCase):
+    def setUp(self):
+        self.transport = MemoryTransport()
+        self.transport.add("POST", "oauth2/token", {"access_token": "token"})
+        stream = {"id": "1", "game_name": "Chess", "language": "en", "tag_ids": ["a"]}
+        self.transport.add(
+            "GET", "streams", {"data": [stream], "pagination": {"cursor": "next"}}
+        )
+
+    def round_trip(self, **kwargs):
+        client = TwitchAPIClient(
+            "client_id",
+            "client_secret",
+            rate_limiter=None,
+            transport=self.transport,
+            **kwargs,
+        )
+        for fields in (None, ["id", "game_name"]):
+            page = client.get_streams(first=1, fields=fields)
+            self.assertEqual(pickle.loads(pickle.dumps(page)), page)
+            item = pickle.loads(pickle.dumps(page.data[0]))
+            self.assertEqual(item, page.data[0])
+            self.assertIs(type(item), type(page.data[0]))
+            self.assertTrue(type(item).__name__.endswith("StreamsModelData"))
+            self.assertNotIsInstance(item, StreamsModel.Data)
+            self.assertNotIn("StreamsModel.Data", repr(item))
+
+    def test_compact(self):
+        self.round_trip(compact=True)
+
+    def test_frozen(self):
+        self.round_trip(compact=True, frozen=True)
+
+    def test_lazy(self):
+        self.round_trip(lazy=True)
+
+
+class EventSubTest(unittest.TestCase):
+    secret = "secret"
+
+    def setUp(self):
+        self.receiver = EventSubReceiver(self.secret, queue_size=1)
+        self.received = []
+        self.release = threading.Event()
+
+        @self.receiver.on("stream.online")
+        def online(message):
+            self.received.append(message)
+            self.release.wait(5)
+
+    def tearDown(self):
+        self.release.set()
+        self.receiver.stop()
+
+    def deliver(self, message_id, payload, timestamp=None, secret=None, kind=None):
+        body = json.dumps(payload).encode()
+        timestamp = timestamp or time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        headers = {
+            "twitch-eventsub-message-id": message_id,
+            "twitch-eventsub-message-timestamp": timestamp,
+            "twitch-eventsub-message-signature": sign(
+                secret or self.secret, message_id, timestamp, body
+            ),
+            "twitch-eventsub-message-type": kind or "notification",
+        }
+        return self.receiver.process(headers, body)[::2]
+
+    def notification(self, user_id="1"):
+        return {
+            "subscription": {"type": "stream.online", "version": "1"},
+            "event": {"broadcaster_user_id": user_id, "type": "live"},
+        }
+
+    def test_valid_signature(self):
+        self.release.set()
+        self.assertEqual(self.deliver("a", self.notification()), (204, b""))
+        self.receiver.join()
+        self.assertEqual(len(self.received), 1)
+        self.assertEqual(self.received[0].event.broadcaster_user_id, "1")
+
+    def test_bad_signature(self):
+        status, _ = self.deliver("a", self.notification(), secret="wrong")
+        self.assertEqual(status, 403)
+        self.assertEqual(self.receiver.stats["rejected"], 1)
+
+    def test_stale_timestamp(self):
+        status, _ = self.deliver(
+            "a", self.notification(), timestamp="2020-01-01T00:00:00.000000000Z"
+        )
+        self.assertEqual(status, 403)
+        self.assertEqual(self.received, [])
+
+    def test_verification_challenge(self):
+        payload = {"challenge": "pogchamp", "subscription": {}}
+        result = self.deliver("a", payload, kind="webhook_callback_verification")
+        self.assertEqual(result, (200, b"pogchamp"))
+
+    def test_duplicate_message_id(self):
+        self.release.set()
+        self.assertEqual(self.deliver("a", self.notification())[0], 204)
+        self.assertEqual(self.deliver("a", self.notification())[0], 204)
+        self.receiver.join()
+        self.assertEqual(len(self.received), 1)
+        self.assertEqual(self.receiver.stats["duplicates"], 1)
+
+    def test_full_queue(self):
+        self.assertEqual(self.deliver("a", self.notification())[0], 204)
+        deadline = time.monotonic() + 5
+        while not self.received and time.monotonic() < deadline:
+            time.sleep(0.001)
+        self.assertEqual(self.deliver("b", self.notification())[0], 204)
+        self.assertEqual(self.deliver("c", self.notification())[0], 503)
+        self.assertEqual(self.receiver.stats["dropped"], 1)
+
+        self.release.set()
+        self.receiver.join()
+        self.assertEqual(self.deliver("c", self.notification())[0], 204)
+
+    def test_subscription_body(self):
+        transport = MemoryTransport(record=True)
+        transport.add("POST", "oauth2/token", {"access_token": "token"})
+        sent = []
+
+        def subscribe(params):
+            sent.append(params)
+            return {"data": [dict(params, id="1", status="pending")]}
+
+        transport.add("POST", "eventsub/subscriptions", subscribe, 202)
+        request = transport.request
+
+        def record(method, url, **kwargs):
+            if url.endswith("subscriptions"):
+                self.assertIsNone(kwargs["params"])
+            return request(method, url, **kwargs)
+
+        transport.request = record
+        client = TwitchAPIClient(
+            "client_id", "client_secret", rate_limiter=None, transport=transport
+        )
+        condition = {"broadcaster_user_id": "1"}
+        callback = {"method": "webhook", "callback": "https://example.com"}
+        result = client.post_eventsub_subscriptions(
+            type="stream.online", version="1", condition=condition, transport=callback
+        )
+        self.assertEqual(sent[0]["condition"], condition)
+        self.assertEqual(sent[0]["transport"], callback)
+        self.assertEqual(result.data[0].status, "pending")
 
 
 if __name__ == "__main__":
-    pass
+    unittest.main()
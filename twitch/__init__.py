@@ -1,3 +1,4 @@
 from .client import *
+from .aio import AsyncTwitchAPIClient
 
-__all__ = ["TwitchAPIClient"]
+__all__ = ["TwitchAPIClient", "AsyncTwitchAPIClient"]
@@ -0,0 +1,171 @@
+import asyncio
+import time
+
+from .client import TwitchAPIClient
+from .exception import APIError, NotProvideError
+
+
+def _query(params):
+    query = []
+    for key, value in params.items():
+        if value is None:
+            continue
+        for item in value if isinstance(value, (list, tuple)) else [value]:
+            query.append(
+                (key, str(item).lower() if isinstance(item, bool) else str(item))
+            )
+    return query
+
+
+def async_api_call(spec):
+    async def _call(client, fields=None, **kwargs):
+        if spec.oauth:
+            raise NotProvideError(
+                message=f"py-twitch does not support '{spec.path}' yet"
+            )
+        spec.validate(kwargs)
+        params, body = (None, kwargs) if spec.body else (_query(kwargs), None)
+        bearer_token = await client._ensure_bearer()
+        refreshed = False
+
+        while True:
+            async with client._semaphore:
+                session = await client._get_session()
+                async with session.request(
+                    spec.method,
+                    spec.url(client._uri),
+                    headers={
+                        "client-id": client._client_id,
+                        "Authorization": f"Bearer {bearer_token}",
+                    },
+                    params=params,
+                    json=body,
+                ) as response:
+                    content = await response.read()
+
+            if response.status == 401 and not refreshed:
+                refreshed = True
+                bearer_token = await client._refresh_bearer(stale=bearer_token)
+                continue
+            break
+
+        if response.status // 100 != 2:
+            raise APIError(message=content.decode("utf-8", "replace"))
+        return spec.decode(
+            content, client._compact, client._frozen, client._lazy, fields
+        )
+
+    _call.spec = spec
+    return _call
+
+
+class AsyncTwitchAPIClient:
+
+    _uri = TwitchAPIClient._uri
+    _auth_url = TwitchAPIClient._auth_url
+
+    def __init__(
+        self,
+        client_id,
+        client_secret,
+        max_concurrency=100,
+        compact=False,
+        frozen=False,
+        lazy=False,
+        refresh_margin=300.0,
+    ):
+        self._client_id = client_id
+        self._client_secret = client_secret
+        self._max_concurrency = max_concurrency
+        self._compact = compact
+        self._frozen = frozen
+        self._lazy = lazy
+        self._session = None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._bearer_lock = asyncio.Lock()
+        self._bearer_token = None
+        self._expires_at = 0.0
+        self._refresh_at = 0.0
+        self._refresh_margin = refresh_margin
+        self._refresh_task = None
+
+    async def __aenter__(self):
+        await self._ensure_bearer()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def _get_session(self):
+        if self._session is None:
+            import aiohttp
+
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self._max_concurrency)
+            )
+        return self._session
+
+    async def _ensure_bearer(self):
+        token = self._bearer_token
+        now = time.monotonic()
+        if token is not None and now < self._expires_at:
+            if now >= self._refresh_at and self._refresh_task is None:
+                self._refresh_task = asyncio.ensure_future(
+                    self._refresh_in_background(token)
+                )
+            return token
+        return await self._refresh_bearer(stale=token)
+
+    async def _refresh_bearer(self, stale=None):
+        async with self._bearer_lock:
+            if self._bearer_token is not None and self._bearer_token != stale:
+                return self._bearer_token
+
+            token, expires_in = await self._bearer_generator()
+            self._bearer_token = token
+            if expires_in:
+                now = time.monotonic()
+                self._expires_at = now + expires_in
+                self._refresh_at = now + max(
+                    expires_in - self._refresh_margin, expires_in / 2
+                )
+            else:
+                self._expires_at = self._refresh_at = float("inf")
+            return token
+
+    async def _refresh_in_background(self, stale):
+        try:
+            await self._refresh_bearer(stale=stale)
+        except Exception:
+            pass
+        finally:
+            self._refresh_task = None
+
+    async def _bearer_generator(self):
+        session = await self._get_session()
+        async with session.post(
+            self._auth_url,
+            params={
+                "client_id": self._client_id,
+                "client_secret": self._client_secret,
+                "grant_type": "client_credentials",
+            },
+        ) as response:
+            auth_response = await response.json(content_type=None)
+
+        if "access_token" not in auth_response:
+            raise Exception("Wrong Client Key")
+        return auth_response.get("access_token"), auth_response.get("expires_in")
+
+    async def close(self):
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+for _name, _member in vars(TwitchAPIClient).items():
+    if hasattr(_member, "spec"):
+        setattr(AsyncTwitchAPIClient, _name, async_api_call(_member.spec))
@@ -0,0 +1,57 @@
+import threading
+import time
+
+
+class TokenManager:
+    def __init__(self, fetch, refresh_margin=300.0):
+        self._fetch = fetch
+        self.refresh_margin = refresh_margin
+        self._lock = threading.Lock()
+        self._token = None
+        self._expires_at = 0.0
+        self._refresh_at = 0.0
+        self._refreshing = threading.Lock()
+
+    @property
+    def expires_at(self):
+        return self._expires_at
+
+    def get(self):
+        token, expires_at = self._token, self._expires_at
+        now = time.monotonic()
+        if token is not None and now < expires_at:
+            if now >= self._refresh_at:
+                self._refresh_in_background(token)
+            return token
+        return self.refresh(stale=token)
+
+    def refresh(self, stale=None):
+        with self._lock:
+            if self._token is not None and self._token != stale:
+                return self._token
+
+            token, expires_in = self._fetch()
+            self._token = token
+            if expires_in:
+                now = time.monotonic()
+                self._expires_at = now + expires_in
+                self._refresh_at = now + max(
+                    expires_in - self.refresh_margin, expires_in / 2
+                )
+            else:
+                self._expires_at = self._refresh_at = float("inf")
+            return token
+
+    def _refresh_in_background(self, stale):
+        if not self._refreshing.acquire(blocking=False):
+            return
+
+        def _refresh():
+            try:
+                self.refresh(stale=stale)
+            except Exception:
+                pass
+            finally:
+                self._refreshing.release()
+
+        threading.Thread(target=_refresh, daemon=True).start()
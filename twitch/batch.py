@@ -0,0 +1,188 @@
+import threading
+
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import fields
+from types import MethodType
+
+from .exception import ValidationError
+from .lazy import replace
+from .pagination import iter_pages
+from .params import BaseParam
+
+_EMPTY = b'{"data": [], "pagination": {}}'
+
+
+def _batched_keys(method, kwargs):
+    params = method.spec.params
+    keys = []
+    for key, value in kwargs.items():
+        restrict = params.get(key)
+        if isinstance(restrict, BaseParam) and restrict.max_items:
+            if value is not None and not isinstance(value, str):
+                keys.append(key)
+    return keys
+
+
+def _chunks(values, size):
+    seen = set()
+    chunk = []
+    for value in values:
+        if value in seen:
+            continue
+        seen.add(value)
+        chunk.append(value)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _fetch(method, kwargs):
+    return list(iter_pages(method, **kwargs))
+
+
+def _ordered(data, key, chunk):
+    if not data or not hasattr(data[0], key):
+        return data
+    order = {value: index for index, value in enumerate(chunk)}
+    return sorted(data, key=lambda item: order.get(getattr(item, key), len(order)))
+
+
+def _iter_bulk_pages(method, max_workers, kwargs):
+    params = method.spec.params
+    keys = _batched_keys(method, kwargs)
+    static = {key: value for key, value in kwargs.items() if key not in keys}
+    fetch = method.__self__._with_priority(_fetch)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque()
+        for key in keys:
+            for chunk in _chunks(kwargs[key], params[key].max_items):
+                call_kwargs = dict(static, **{key: chunk})
+                pending.append(
+                    (key, chunk, executor.submit(fetch, method, call_kwargs))
+                )
+
+                while len(pending) > max_workers * 2:
+                    key_, chunk_, future = pending.popleft()
+                    yield key_, chunk_, future.result()
+
+        while pending:
+            key_, chunk_, future = pending.popleft()
+            yield key_, chunk_, future.result()
+
+
+def iter_bulk(method, max_workers=8, **kwargs):
+    for key, chunk, pages in _iter_bulk_pages(method, max_workers, kwargs):
+        data = [item for page in pages for item in page.data]
+        yield from _ordered(data, key, chunk)
+
+
+def bulk(method, max_workers=8, **kwargs):
+    merged = None
+    data = []
+    for key, chunk, pages in _iter_bulk_pages(method, max_workers, kwargs):
+        merged = merged or pages[0]
+        data.extend(
+            _ordered([item for page in pages for item in page.data], key, chunk)
+        )
+
+    if merged is None:
+        if not _batched_keys(method, kwargs):
+            raise ValidationError(message="Nothing to look up")
+        client = method.__self__
+        return method.spec.decode(_EMPTY, client._compact, client._frozen, client._lazy)
+    return _merged(merged, data)
+
+
+def _merged(page, data):
+    if hasattr(page, "pagination"):
+        return replace(
+            page, data=data, pagination=replace(page.pagination, cursor=None)
+        )
+    return replace(page, data=data)
+
+
+def bulk_call(func):
+    def _bulk(client, max_workers=8, **kwargs):
+        return bulk(MethodType(func, client), max_workers=max_workers, **kwargs)
+
+    _bulk.batches = func
+    return _bulk
+
+
+class _Batch:
+    def __init__(self):
+        self.values = []
+        self.waiters = []
+        self.full = threading.Event()
+
+
+class Coalescer:
+
+    keys = {"id", "login", "name", "user_id", "user_login", "tag_id", "code"}
+
+    def __init__(self, window=0.005):
+        self.window = window
+        self._lock = threading.Lock()
+        self._batches = {}
+
+    def accepts(self, spec, kwargs):
+        if len(kwargs) != 1:
+            return False
+
+        ((key, value),) = kwargs.items()
+        restrict = spec.params.get(key)
+        data = getattr(spec.model, "Data", None)
+        return (
+            key in self.keys
+            and isinstance(value, str)
+            and isinstance(restrict, BaseParam)
+            and bool(restrict.max_items)
+            and data is not None
+            and key in {field.name for field in fields(data)}
+        )
+
+    def submit(self, method, kwargs):
+        ((key, value),) = kwargs.items()
+        batch_key = (method.spec, key)
+        future = Future()
+
+        with self._lock:
+            batch = self._batches.get(batch_key)
+            leader = batch is None
+            if leader:
+                batch = self._batches[batch_key] = _Batch()
+            if value not in batch.values:
+                batch.values.append(value)
+            batch.waiters.append((value, future))
+            if len(batch.values) >= method.spec.params[key].max_items:
+                del self._batches[batch_key]
+                batch.full.set()
+
+        if leader:
+            batch.full.wait(self.window)
+            with self._lock:
+                if self._batches.get(batch_key) is batch:
+                    del self._batches[batch_key]
+            self._flush(method, key, batch)
+        return future.result()
+
+    def _flush(self, method, key, batch):
+        try:
+            pages = _fetch(method, {key: batch.values})
+        except Exception as error:
+            for _, future in batch.waiters:
+                future.set_exception(error)
+            return
+
+        data = [item for page in pages for item in page.data]
+        for value, future in batch.waiters:
+            own = [item for item in data if _same(getattr(item, key), value)]
+            future.set_result(_merged(pages[0], own))
+
+
+def _same(left, right):
+    return isinstance(left, str) and left.lower() == right.lower()
@@ -0,0 +1,213 @@
+import os
+import sqlite3
+import threading
+import time
+
+from collections import OrderedDict
+from concurrent.futures import Future
+from urllib.parse import urlencode
+
+
+def cache_key(spec, params):
+    query = []
+    for key, value in sorted(params.items()):
+        if value is None:
+            continue
+        if isinstance(value, (list, tuple)):
+            value = sorted(str(item) for item in value)
+        query.append((key, value))
+    return f"{spec.method} {spec.path}?{urlencode(query, doseq=True)}"
+
+
+def local_connection(local, path, timeout):
+    connection = getattr(local, "connection", None)
+    if connection is None or local.pid != os.getpid():
+        connection = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        local.connection = connection
+        local.pid = os.getpid()
+    return connection
+
+
+class MemoryCache:
+    def __init__(self, maxsize=1024, max_bytes=None):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._bytes = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None:
+                expires_at, value = item
+                if expires_at > time.monotonic():
+                    self._items.move_to_end(key)
+                    self.hits += 1
+                    return value
+                self._remove(key)
+            self.misses += 1
+            return None
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            if key in self._items:
+                self._remove(key)
+            self._items[key] = (time.monotonic() + ttl, value)
+            self._bytes += len(value)
+
+            while self._items and (
+                len(self._items) > self.maxsize
+                or (self.max_bytes is not None and self._bytes > self.max_bytes)
+            ):
+                self._remove(next(iter(self._items)))
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            if key in self._items:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._bytes = 0
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._items),
+            "bytes": self._bytes,
+        }
+
+    def _remove(self, key):
+        _, value = self._items.pop(key)
+        self._bytes -= len(value)
+
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, func):
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = func()
+        except BaseException as error:
+            future.set_exception(error)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+
+class SQLiteCache:
+    def __init__(self, path, max_entries=None, timeout=30.0, purge_every=1000):
+        self.path = path
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self.purge_every = purge_every
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+        connection = self._connection()
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, expires_at REAL NOT NULL, value BLOB NOT NULL)"
+        )
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS responses_expires_at ON responses (expires_at)"
+        )
+
+    def _connection(self):
+        return local_connection(self._local, self.path, self.timeout)
+
+    def __len__(self):
+        row = self._connection().execute(
+            "SELECT COUNT(*) FROM responses WHERE expires_at > ?", (time.time(),)
+        )
+        return row.fetchone()[0]
+
+    def get(self, key):
+        row = (
+            self._connection()
+            .execute(
+                "SELECT value FROM responses WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            )
+            .fetchone()
+        )
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return bytes(row[0])
+
+    def set(self, key, value, ttl):
+        connection = self._connection()
+        connection.execute(
+            "INSERT OR REPLACE INTO responses (key, expires_at, value) VALUES (?, ?, ?)",
+            (key, time.time() + ttl, sqlite3.Binary(value)),
+        )
+        with self._lock:
+            self._writes += 1
+            purge = self._writes % self.purge_every == 0
+        if purge:
+            self.purge()
+
+    def purge(self):
+        connection = self._connection()
+        cursor = connection.execute(
+            "DELETE FROM responses WHERE expires_at <= ?", (time.time(),)
+        )
+        evictions = cursor.rowcount
+        if self.max_entries is not None:
+            cursor = connection.execute(
+                "DELETE FROM responses WHERE key IN ("
+                "SELECT key FROM responses ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            evictions += cursor.rowcount
+        with self._lock:
+            self.evictions += evictions
+
+    def delete(self, key):
+        self._connection().execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def clear(self):
+        self._connection().execute("DELETE FROM responses")
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self),
+        }
@@ -0,0 +1,76 @@
+import json
+import threading
+import time
+
+from .cache import cache_key, local_connection
+from .pagination import _cursor, iter_pages
+
+
+class CheckpointStore:
+    def __init__(self, path, timeout=30.0):
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        self._connection().execute(
+            "CREATE TABLE IF NOT EXISTS checkpoints ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+        )
+
+    def _connection(self):
+        return local_connection(self._local, self.path, self.timeout)
+
+    def load(self, key):
+        row = (
+            self._connection()
+            .execute("SELECT value FROM checkpoints WHERE key = ?", (key,))
+            .fetchone()
+        )
+        return json.loads(row[0]) if row is not None else None
+
+    def save(self, key, checkpoint):
+        self._connection().execute(
+            "INSERT OR REPLACE INTO checkpoints (key, value) VALUES (?, ?)",
+            (key, json.dumps(checkpoint)),
+        )
+
+    def delete(self, key):
+        self._connection().execute("DELETE FROM checkpoints WHERE key = ?", (key,))
+
+    def keys(self):
+        rows = self._connection().execute("SELECT key FROM checkpoints ORDER BY key")
+        return [row[0] for row in rows]
+
+
+def _normalized(params):
+    return json.loads(json.dumps(params, sort_keys=True, default=str))
+
+
+def checkpointed_pages(method, store, key=None, every=1, **kwargs):
+    prefetch = kwargs.pop("prefetch", False)
+    raw = kwargs.pop("raw", False)
+    params = _normalized({k: v for k, v in kwargs.items() if k != "after"})
+    if key is None:
+        key = cache_key(method.spec, params)
+
+    emitted = 0
+    checkpoint = store.load(key)
+    if checkpoint is not None and checkpoint["params"] == params:
+        kwargs["after"] = checkpoint["cursor"]
+        emitted = checkpoint["emitted"]
+
+    pages = iter_pages(method, prefetch=prefetch, raw=raw, **kwargs)
+    for count, page in enumerate(pages, 1):
+        yield page
+        emitted += len(page["data"] if isinstance(page, dict) else page.data)
+        cursor = _cursor(page)
+        if cursor and count % every == 0:
+            store.save(
+                key,
+                {
+                    "params": params,
+                    "cursor": cursor,
+                    "emitted": emitted,
+                    "updated_at": time.time(),
+                },
+            )
+    store.delete(key)
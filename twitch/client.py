@@ -1,96 +1,67 @@
-import json
+import threading
+import time
 import requests
 
-from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from time import perf_counter
+from types import MethodType
 from typing import Dict, TypeVar, Callable, Union
-from urllib.parse import urljoin
-from dacite import from_dict
-from ast import literal_eval
 
 from .models import *
 from .params import BaseParam
-from .exception import APIError, ValidationError, NotProvideError
+from .spec import EndpointSpec
+from .decoder import loads
+from .auth import TokenManager
+from .pagination import paginate, paginated
+from .batch import Coalescer, bulk_call, iter_bulk
+from .columnar import collect_columns
+from .fanout import fan_out
+from .cache import MemoryCache, SingleFlight, cache_key
+from .identity import IdentityResolver
+from .metrics import Metrics
+from .ratelimit import RateLimiter
+from .transport import RequestsTransport
+from .retry import RetryPolicy
+from .exception import APIError, NotProvideError
 
 T = TypeVar("T")
 
 
-def api_call(model: T = None, oauth=False, **config) -> Callable[..., T]:
-    class APIMethod(object):
-
-        path = config["path"]
-        method = config.get("method", "get")
-        params = dict()
-
-        def __init__(self, client, **kwargs):
-
-            if oauth:
-                raise NotProvideError(
-                    message=f"py-twitch does not support '{self.path}' yet"
-                )
-
-            self.model = model if model else config.get("model")
-            self.client = client
-            self.header = {
-                "client-id": self.client._client_id,
-                "Authorization": f"Bearer {self.client._bearer_token}",
-            }
-            self.params_restrict = dict()
-
-            for _, item in config.items():
-                if isinstance(item, BaseParam):
-                    self.params_restrict[item.name] = item
-
-            for key in kwargs.keys():
-                self.params[key] = kwargs[key]
-            self.url = urljoin(client._uri, self.path)
-
-        def set_validate(self):
-            required_sets = defaultdict(list)
-
-            for key, restrict in self.params_restrict.items():
-                required_sets[restrict.required_set].append(key in self.params.keys())
-
-            for key, item in required_sets.items():
-                if not any(item):
-                    raise ValidationError(message=f"Some fields is required ({key})")
-
-        def validate(self):
-            query_params = set(self.params.keys()) - set(self.params_restrict.keys())
-            if len(query_params) != 0:
-                raise ValidationError(
-                    message=f"{list(query_params)} is not API query parameter.",
-                )
-
-            for key, item in self.params_restrict.items():
-                item.validate(self.params.get(item.name))
-
-        def _request(self, url, params, header):
-            request = getattr(self.client._session, self.method.lower())
-            response = request(url=url, headers=self.header, params=self.params)
-
-            if response.status_code // 100 != 2:
-                raise APIError(message=response.text)
-            return response
-
-        def execute(self):
-            self.set_validate()
-            self.validate()
-            response = self._request(self.url, self.params, self.header)
-            if self.model == dict:
-
-                return literal_eval(response.text)
-            elif self.model:
-                try:
-                    return from_dict(self.model, response.json())
-                except Exception:
-                    raise APIError(message=response.text)
-            else:
-                return response.json()
-
-    def _call(client, **kwargs):
-        api = APIMethod(client, **kwargs)
-        return api.execute()
+def _observe_response(sample, response):
+    request = getattr(response, "request", None)
+    sample.status_codes.append(response.status_code)
+    sample.bytes_in += len(response.content)
+    if request is not None:
+        sample.bytes_out += len(str(request.url)) + sum(
+            len(key) + len(value) + 4 for key, value in request.headers.items()
+        )
+    remaining = response.headers.get("Ratelimit-Remaining")
+    if remaining is not None:
+        sample.budget = int(remaining)
+
 
+def api_call(model: T = None, oauth=False, **config) -> Callable[..., T]:
+    spec = EndpointSpec(model=model, oauth=oauth, **config)
+
+    def _call(client, fields=None, **kwargs):
+        coalescer = client._coalescer
+        if fields is None and coalescer is not None and coalescer.accepts(spec, kwargs):
+            return coalescer.submit(MethodType(_call, client), kwargs)
+
+        metrics = client.metrics
+        if metrics is None:
+            content = client._execute(spec, kwargs)
+            result = spec.decode(
+                content, client._compact, client._frozen, client._lazy, fields
+            )
+        else:
+            result = client._measured(spec, kwargs, fields, metrics)
+        if client.identity is not None:
+            client.identity.observe(result)
+        return result
+
+    _call.spec = spec
     return _call
 
 
@@ -99,25 +70,267 @@ class TwitchAPIClient:
     _uri = "https://api.twitch.tv/helix/"
     _auth_url = "https://id.twitch.tv/oauth2/token"
 
-    def __init__(self, client_id, client_secret):
+    def __init__(
+        self,
+        client_id,
+        client_secret,
+        coalesce_window=None,
+        rate_limiter=True,
+        retry_policy=True,
+        compact=False,
+        frozen=False,
+        lazy=False,
+        cache=None,
+        identity=None,
+        metrics=None,
+        transport=None,
+        max_connections=16,
+        max_workers=None,
+    ):
         self._client_id = client_id
         self._client_secret = client_secret
-        self._session = requests.Session()
-        self._bearer_token = self._bearer_generator()
+        self._transport = (
+            RequestsTransport(max_connections) if transport is None else transport
+        )
+        self._coalescer = Coalescer(coalesce_window) if coalesce_window else None
+        self._rate_limiter = RateLimiter() if rate_limiter is True else rate_limiter
+        self._retry_policy = RetryPolicy() if retry_policy is True else retry_policy
+        self._token_manager = TokenManager(self._bearer_generator)
+        self._header_cache = None
+        self._compact = compact
+        self._frozen = frozen
+        self._lazy = lazy
+        self._cache = MemoryCache() if cache is True else cache
+        self._single_flight = SingleFlight()
+        self.identity = IdentityResolver() if identity is True else identity
+        if self.identity is not None:
+            self.identity.client = self
+        self.metrics = Metrics() if metrics is True else metrics
+        self._max_workers = max_workers or max_connections
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    @property
+    def _bearer_token(self):
+        return self._token_manager.get()
 
     def _bearer_generator(self):
-        auth_response = self._session.post(
+        auth_response = self._transport.request(
+            "POST",
             self._auth_url,
             params={
                 "client_id": self._client_id,
                 "client_secret": self._client_secret,
                 "grant_type": "client_credentials",
             },
+            timeout=self._retry_policy.timeout if self._retry_policy else None,
         ).json()
 
         if "access_token" not in auth_response:
             raise Exception("Wrong Client Key")
-        return auth_response.get("access_token")
+        return auth_response.get("access_token"), auth_response.get("expires_in")
+
+    def _header(self, bearer_token):
+        header = self._header_cache
+        if header is None or header[0] != bearer_token:
+            header = self._header_cache = (
+                bearer_token,
+                {
+                    "client-id": self._client_id,
+                    "Authorization": f"Bearer {bearer_token}",
+                },
+            )
+        return header[1]
+
+    def _send(self, method, url, params, header, sample=None, body=None):
+        limiter = self._rate_limiter
+        policy = self._retry_policy
+        if sample is not None:
+            queued = perf_counter()
+        if limiter:
+            limiter.acquire()
+        if sample is not None:
+            sent = perf_counter()
+            sample.queue += sent - queued
+        try:
+            response = self._transport.request(
+                method,
+                url,
+                headers=header,
+                params=params,
+                timeout=policy.timeout if policy else None,
+                **({} if body is None else {"json": body}),
+            )
+        except Exception:
+            if limiter:
+                limiter.update()
+            raise
+        finally:
+            if sample is not None:
+                sample.network += perf_counter() - sent
+        if limiter:
+            limiter.update(response.headers, response.status_code)
+        return response
+
+    def _request(self, spec, params, sample=None):
+        url = spec.url(self._uri)
+        limiter = self._rate_limiter
+        policy = self._retry_policy
+        started = time.monotonic()
+        attempt = replays = 0
+        refreshed = False
+        bearer_token = self._bearer_token
+        header = self._header(bearer_token)
+        body = None
+        if spec.body:
+            params, body = None, params
+
+        while True:
+            try:
+                response = self._send(spec.method, url, params, header, sample, body)
+            except (requests.ConnectionError, requests.Timeout) as error:
+                if policy and policy.wait(
+                    spec.path, spec.method, attempt, started, error=error
+                ):
+                    attempt += 1
+                    continue
+                raise
+
+            if sample is not None:
+                _observe_response(sample, response)
+
+            if response.status_code == 401 and not refreshed:
+                refreshed = True
+                bearer_token = self._token_manager.refresh(stale=bearer_token)
+                header = self._header(bearer_token)
+                continue
+            elif response.status_code == 429 and limiter:
+                if replays < limiter.max_replays:
+                    replays += 1
+                    continue
+            elif response.status_code // 100 == 5 and policy:
+                if policy.wait(
+                    spec.path, spec.method, attempt, started, response=response
+                ):
+                    attempt += 1
+                    continue
+            break
+
+        if sample is not None:
+            sample.retries = attempt + replays + refreshed
+        if response.status_code // 100 != 2:
+            raise APIError(message=response.text)
+        return response
+
+    def _execute(self, spec, kwargs, sample=None):
+        if spec.oauth:
+            raise NotProvideError(
+                message=f"py-twitch does not support '{spec.path}' yet"
+            )
+
+        spec.validate(kwargs)
+        params = {
+            key: list(value) if isinstance(value, (list, tuple)) else value
+            for key, value in kwargs.items()
+        }
+        cache = self._cache
+        if cache is None or not spec.cache_ttl or spec.method != "GET":
+            return self._request(spec, params, sample).content
+
+        key = cache_key(spec, params)
+        content = cache.get(key)
+        if content is None:
+            content = self._single_flight.do(
+                key, lambda: self._fill_cache(spec, params, key, sample)
+            )
+        elif sample is not None:
+            sample.cached = True
+        return content
+
+    def _fill_cache(self, spec, params, key, sample=None):
+        content = self._request(spec, params, sample).content
+        self._cache.set(key, content, spec.cache_ttl)
+        return content
+
+    def _measured(self, spec, kwargs, fields, metrics):
+        sample = metrics.start(spec, kwargs)
+        try:
+            content = self._execute(spec, kwargs, sample)
+            decoding = perf_counter()
+            result = spec.decode(
+                content, self._compact, self._frozen, self._lazy, fields
+            )
+            sample.decode = perf_counter() - decoding
+            data = getattr(result, "data", None)
+            sample.records = len(data) if data is not None else 1
+            return result
+        except Exception as error:
+            sample.error = error
+            raise
+        finally:
+            metrics.finish(sample)
+
+    def _get_executor(self):
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self._max_workers, thread_name_prefix="twitch"
+                    )
+        return self._executor
+
+    def _with_priority(self, func):
+        limiter = self._rate_limiter
+        return limiter.bind(func) if limiter else func
+
+    def submit(self, method, **kwargs):
+        method.spec.validate({k: v for k, v in kwargs.items() if k != "fields"})
+        return self._get_executor().submit(self._with_priority(method), **kwargs)
+
+    def map(
+        self,
+        method,
+        kwargs_iterable,
+        window=None,
+        ordered=True,
+        return_exceptions=False,
+    ):
+        return fan_out(
+            self._get_executor(),
+            self._with_priority(method),
+            kwargs_iterable,
+            window=window or self._max_workers,
+            ordered=ordered,
+            return_exceptions=return_exceptions,
+        )
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self._transport.close()
+
+    def raw(self, method, **kwargs):
+        return loads(self._execute(method.spec, kwargs))
+
+    def cache_stats(self):
+        return self._cache.stats() if self._cache is not None else None
+
+    def collect_columns(self, method, columns=None, prefetch=False, **kwargs):
+        return collect_columns(method, columns=columns, prefetch=prefetch, **kwargs)
+
+    def priority(self, priority):
+        if not self._rate_limiter:
+            return nullcontext()
+        return self._rate_limiter.priority(priority)
+
+    def paginate(self, method, prefetch=False, columnar=False, columns=None, **kwargs):
+        return paginate(
+            method, prefetch=prefetch, columnar=columnar, columns=columns, **kwargs
+        )
+
+    def iter_bulk(self, method, max_workers=8, **kwargs):
+        return iter_bulk(method, max_workers=max_workers, **kwargs)
 
     # Method Block
 
@@ -163,6 +376,7 @@ class TwitchAPIClient:
         path="bits/cheermotes",
         method="GET",
         model=BitsCheermotesModel,
+        cache_ttl=3600,
         broadcaster_id=BaseParam(name="broadcaster_id", types=str),
     )
 
@@ -172,9 +386,9 @@ class TwitchAPIClient:
         method="GET",
         model=ExtensionTransactionsModel,
         extension_id=BaseParam(name="extension_id", types=str, required=True),
-        id=BaseParam(name="extension_id", types=Union[List, str]),
-        after=BaseParam(name="extension_id", types=str),
-        first=BaseParam(name="extension_id", types=int, maximum=100),
+        id=BaseParam(name="id", types=Union[List, str], max_items=100),
+        after=BaseParam(name="after", types=str),
+        first=BaseParam(name="first", types=int, maximum=100),
     )
 
     # https://dev.twitch.tv/docs/api/reference#get-channel-information
@@ -256,7 +470,7 @@ class TwitchAPIClient:
         path="entitlements/codes",
         method="GET",
         model=CodesModel,
-        code=BaseParam(name="code", types=Union[list, str]),
+        code=BaseParam(name="code", types=Union[list, str], max_items=20),
         user_id=BaseParam(name="user_id", types=int),
     )
 
@@ -279,6 +493,7 @@ class TwitchAPIClient:
         path="eventsub/subscriptions",
         method="POST",
         model=EventsubSubscriptionsModel,
+        body=True,
         type=BaseParam(name="type", types=str, required=True),
         version=BaseParam(name="version", types=str, required=True),
         condition=BaseParam(name="condition", types=dict, required=True),
@@ -317,11 +532,20 @@ class TwitchAPIClient:
         path="games",
         method="GET",
         model=GamesModel,
+        cache_ttl=3600,
         id=BaseParam(
-            name="id", types=Union[List, str], required=True, required_set="info"
+            name="id",
+            types=Union[List, str],
+            required=True,
+            required_set="info",
+            max_items=100,
         ),
         name=BaseParam(
-            name="name", types=Union[List, str], required=True, required_set="info"
+            name="name",
+            types=Union[List, str],
+            required=True,
+            required_set="info",
+            max_items=100,
         ),
     )
 
@@ -361,6 +585,8 @@ class TwitchAPIClient:
         method="GET",
         model=CategoriesModel,
         query=BaseParam(name="query", types=str, required=True),
+        after=BaseParam(name="after", types=str),
+        first=BaseParam(name="first", types=int, maximum=100),
     )
 
     # https://dev.twitch.tv/docs/api/reference#search-channels
@@ -369,6 +595,8 @@ class TwitchAPIClient:
         method="GET",
         model=SearchChannelModel,
         query=BaseParam(name="query", types=str, required=True),
+        after=BaseParam(name="after", types=str),
+        first=BaseParam(name="first", types=int, maximum=100),
     )
 
     # https://dev.twitch.tv/docs/api/reference#get-stream-key
@@ -382,10 +610,10 @@ class TwitchAPIClient:
         after=BaseParam(name="after", types=str),
         before=BaseParam(name="before", types=str),
         first=BaseParam(name="first", types=int, maximum=100),
-        game_id=BaseParam(name="game_id", types=Union[List, str]),
+        game_id=BaseParam(name="game_id", types=Union[List, str], max_items=100),
         language=BaseParam(name="language", types=str),
-        user_id=BaseParam(name="user_id", types=Union[List, str]),
-        user_login=BaseParam(name="user_login", types=Union[List, str]),
+        user_id=BaseParam(name="user_id", types=Union[List, str], max_items=100),
+        user_login=BaseParam(name="user_login", types=Union[List, str], max_items=100),
     )
 
     # https://dev.twitch.tv/docs/api/reference#get-followed-streams
@@ -418,9 +646,10 @@ class TwitchAPIClient:
         path="tags/streams",
         method="GET",
         model=TagsModel,
+        cache_ttl=86400,
         after=BaseParam(name="after", types=str),
         first=BaseParam(name="first", types=int, maximum=100),
-        tag_id=BaseParam(name="tag_id", types=Union[list, str]),
+        tag_id=BaseParam(name="tag_id", types=Union[list, str], max_items=100),
     )
 
     # https://dev.twitch.tv/docs/api/reference#get-stream-tags
@@ -441,6 +670,7 @@ class TwitchAPIClient:
         path="teams/channel",
         method="GET",
         model=TeamsChannelModel,
+        cache_ttl=3600,
         broadcaster_id=BaseParam(name="broadcaster_id", types=str, required=True),
     )
 
@@ -449,6 +679,7 @@ class TwitchAPIClient:
         path="teams",
         method="GET",
         model=TeamsModel,
+        cache_ttl=3600,
         name=BaseParam(name="name", types=str),
         id=BaseParam(name="id", types=str),
     )
@@ -458,8 +689,13 @@ class TwitchAPIClient:
         path="users",
         method="GET",
         model=UsersModel,
-        id=BaseParam(name="id", types=Union[List, str], required_set="user"),
-        login=BaseParam(name="login", types=Union[List, str], required_set="user"),
+        cache_ttl=600,
+        id=BaseParam(
+            name="id", types=Union[List, str], required_set="user", max_items=100
+        ),
+        login=BaseParam(
+            name="login", types=Union[List, str], required_set="user", max_items=100
+        ),
     )
 
     # https://dev.twitch.tv/docs/api/reference#update-user
@@ -521,7 +757,9 @@ class TwitchAPIClient:
         path="videos",
         method="GET",
         model=VideosModel,
-        id=BaseParam(name="id", types=Union[List, str], required_set="info"),
+        id=BaseParam(
+            name="id", types=Union[List, str], required_set="info", max_items=100
+        ),
         user_id=BaseParam(name="user_id", types=str, required_set="info"),
         game_id=BaseParam(name="game_id", types=str, required_set="info"),
         after=BaseParam(name="after", types=str),
@@ -538,5 +776,29 @@ class TwitchAPIClient:
 
     # https://dev.twitch.tv/docs/api/reference#get-webhook-subscriptions
     get_webhooks_subscriptions = api_call(
-        path="webhooks/subscriptions", method="GET", model=WebhooksSubscriptionsModel
+        path="webhooks/subscriptions",
+        method="GET",
+        model=WebhooksSubscriptionsModel,
+        after=BaseParam(name="after", types=str),
+        first=BaseParam(name="first", types=int, maximum=100),
     )
+
+    # Pagination Block
+
+    iter_extensions_transactions = paginated(get_extensions_transactions)
+    iter_clips = paginated(get_clips)
+    iter_games_top = paginated(get_games_top)
+    iter_search_categories = paginated(get_search_categories)
+    iter_search_channels = paginated(get_search_channels)
+    iter_streams = paginated(get_streams)
+    iter_tags_streams = paginated(get_tags_streams)
+    iter_users_follows = paginated(get_users_follows)
+    iter_videos = paginated(get_videos)
+    iter_webhooks_subscriptions = paginated(get_webhooks_subscriptions)
+
+    # Bulk Block
+
+    bulk_get_games = bulk_call(get_games)
+    bulk_get_streams = bulk_call(get_streams)
+    bulk_get_users = bulk_call(get_users)
+    bulk_get_videos = bulk_call(get_videos)
@@ -0,0 +1,156 @@
+from array import array
+from dataclasses import fields
+
+from .compact import INTERN_FIELDS
+from .decoder import _unwrap
+from .pagination import iter_pages
+
+
+class Category:
+
+    __slots__ = ("codes", "categories")
+
+    def __init__(self, codes, categories):
+        self.codes = codes
+        self.categories = categories
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __repr__(self):
+        return f"Category({len(self.codes)} values, {len(self.categories)} categories)"
+
+    def decode(self):
+        import numpy
+
+        categories = numpy.array(list(self.categories) + [None], dtype=object)
+        return categories[self.codes]
+
+
+class Columns:
+    def __init__(self, columns, length):
+        self.columns = columns
+        self.length = length
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def __contains__(self, name):
+        return name in self.columns
+
+    def __iter__(self):
+        return iter(self.columns)
+
+    def __repr__(self):
+        return f"Columns({self.length} rows, {list(self.columns)})"
+
+    def keys(self):
+        return self.columns.keys()
+
+    def to_dict(self):
+        return dict(self.columns)
+
+
+def _kind(field):
+    annotation, _ = _unwrap(field.type)
+    if annotation is bool:
+        return "bool"
+    if annotation is int:
+        return "int"
+    if annotation is float:
+        return "float"
+    if annotation is str:
+        if field.name.endswith("_at"):
+            return "datetime"
+        if field.name == "id" or field.name.endswith("_id"):
+            return "category"
+        if field.name in INTERN_FIELDS:
+            return "category"
+        return "str"
+    return "object"
+
+
+class ColumnBuilder:
+    def __init__(self, model, columns=None):
+        data = getattr(model, "Data", model)
+        self.kinds = {
+            field.name: _kind(field)
+            for field in fields(data)
+            if columns is None or field.name in columns
+        }
+        self.values = {name: [] for name in self.kinds}
+        self.codes = {}
+        self.categories = {}
+        for name, kind in self.kinds.items():
+            if kind == "category":
+                self.codes[name] = array("i")
+                self.categories[name] = {}
+        self.length = 0
+
+    def extend(self, items):
+        for name, kind in self.kinds.items():
+            if kind == "category":
+                codes = self.codes[name]
+                categories = self.categories[name]
+                for item in items:
+                    value = item.get(name)
+                    if value is None:
+                        codes.append(-1)
+                        continue
+                    code = categories.get(value)
+                    if code is None:
+                        code = categories[value] = len(categories)
+                    codes.append(code)
+            elif kind == "datetime":
+                self.values[name].extend(
+                    (item.get(name) or "NaT").rstrip("Z") for item in items
+                )
+            else:
+                self.values[name].extend(item.get(name) for item in items)
+        self.length += len(items)
+
+    def build(self):
+        import numpy
+
+        columns = {}
+        for name, kind in self.kinds.items():
+            values = self.values[name]
+            if kind == "category":
+                columns[name] = Category(
+                    numpy.frombuffer(self.codes[name], dtype=numpy.int32),
+                    list(self.categories[name]),
+                )
+            elif kind == "datetime":
+                columns[name] = numpy.array(values, dtype="datetime64[ms]")
+            elif kind in ("int", "float", "bool"):
+                dtype = {"int": numpy.int64, "float": numpy.float64, "bool": bool}[kind]
+                mask = [value is None for value in values]
+                if any(mask):
+                    filled = [0 if value is None else value for value in values]
+                    columns[name] = numpy.ma.masked_array(
+                        filled, mask=mask, dtype=dtype
+                    )
+                else:
+                    columns[name] = numpy.array(values, dtype=dtype)
+            else:
+                column = numpy.empty(len(values), dtype=object)
+                for index, value in enumerate(values):
+                    column[index] = value
+                columns[name] = column
+        return Columns(columns, self.length)
+
+
+def build_columns(model, items, columns=None):
+    builder = ColumnBuilder(model, columns)
+    builder.extend(items)
+    return builder.build()
+
+
+def collect_columns(method, columns=None, prefetch=False, **kwargs):
+    builder = ColumnBuilder(method.spec.model, columns)
+    for page in iter_pages(method, prefetch=prefetch, raw=True, **kwargs):
+        builder.extend(page["data"])
+    return builder.build()
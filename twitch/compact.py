@@ -0,0 +1,83 @@
+from dataclasses import dataclass, fields, is_dataclass
+from typing import List, Optional, Union
+
+from .decoder import NoneType
+
+INTERN_FIELDS = frozenset(
+    {
+        "broadcaster_language",
+        "broadcaster_type",
+        "game_id",
+        "game_name",
+        "language",
+        "status",
+        "tag_ids",
+        "type",
+        "viewable",
+        "version",
+    }
+)
+
+_models = {}
+
+
+def _rebuild(factory, args, values):
+    return factory(*args)(*values)
+
+
+def _reduce(self):
+    factory, args = self._factory
+    values = tuple(getattr(self, name) for name in self.__slots__)
+    return _rebuild, (factory, args, values)
+
+
+def generated_name(prefix, model):
+    return prefix + model.__qualname__.replace(".", "")
+
+
+def _compact_type(annotation, frozen, intern):
+    if is_dataclass(annotation):
+        return compact_model(annotation, frozen=frozen, intern=intern)
+
+    origin = getattr(annotation, "__origin__", None)
+    args = getattr(annotation, "__args__", None)
+    if origin is Union and args:
+        args = tuple(_compact_type(arg, frozen, intern) for arg in args)
+        if len(args) == 2 and NoneType in args:
+            return Optional[next(arg for arg in args if arg is not NoneType)]
+        return Union[args]
+    if origin is list and args and is_dataclass(args[0]):
+        return List[_compact_type(args[0], frozen, intern)]
+    return annotation
+
+
+def compact_model(model, frozen=False, intern=INTERN_FIELDS):
+    key = (model, frozen, intern)
+    compact = _models.get(key)
+    if compact is not None:
+        return compact
+
+    name = generated_name("Compact", model)
+    namespace = {
+        "__module__": __name__,
+        "__qualname__": name,
+        "__annotations__": {},
+        "__reduce__": _reduce,
+        "_factory": (compact_model, key),
+    }
+    for attribute, value in vars(model).items():
+        if is_dataclass(value) and isinstance(value, type):
+            namespace[attribute] = compact_model(value, frozen=frozen, intern=intern)
+
+    names = []
+    for field in fields(model):
+        namespace["__annotations__"][field.name] = _compact_type(
+            field.type, frozen, intern
+        )
+        names.append(field.name)
+    namespace["__slots__"] = tuple(names)
+    namespace["_intern_fields"] = intern & frozenset(names)
+
+    compact = dataclass(frozen=frozen)(type(name, (), namespace))
+    _models[key] = compact
+    return compact
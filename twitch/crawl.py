@@ -0,0 +1,174 @@
+import queue
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from itertools import islice
+
+from .pagination import iter_pages
+from .snapshot import _value
+
+_DONE = object()
+
+LANGUAGES = tuple(
+    "en id ca da de es fr it hu nl no pl pt ro sk fi sv tl vi tr cs el bg ru uk ar ms "
+    "hi th zh zh-hk ja ko asl other".split()
+)
+
+
+class CrawlReport:
+    def __init__(self, shards):
+        self.shards = shards
+        self.done = set()
+        self.failed = {}
+        self.pages = 0
+        self.streams = 0
+        self.duplicates = 0
+        self.viewers = 0
+        self.per_shard = {shard: 0 for shard in shards}
+        self.started = time.monotonic()
+        self.elapsed = None
+
+    @property
+    def completed(self):
+        return len(self.done)
+
+    @property
+    def coverage(self):
+        read = sum(self.per_shard.values())
+        if not read:
+            return 1.0 if self.completed == len(self.shards) else 0.0
+        return sum(self.per_shard[shard] for shard in self.done) / read
+
+    def __repr__(self):
+        return (
+            f"CrawlReport({self.streams} streams, {self.completed}/{len(self.shards)} "
+            f"shards, {len(self.failed)} failed, {self.pages} pages)"
+        )
+
+    def as_dict(self):
+        return {
+            "shards": len(self.shards),
+            "completed": self.completed,
+            "failed": {shard: repr(error) for shard, error in self.failed.items()},
+            "coverage": self.coverage,
+            "pages": self.pages,
+            "streams": self.streams,
+            "duplicates": self.duplicates,
+            "viewers": self.viewers,
+            "elapsed": self.elapsed,
+        }
+
+
+class StreamCrawler:
+    def __init__(
+        self,
+        client,
+        games=None,
+        languages=None,
+        top_games=None,
+        max_workers=8,
+        priority=None,
+    ):
+        self.client = client
+        self.games = games
+        self.languages = languages
+        self.top_games = top_games
+        self.max_workers = max_workers
+        self.priority = priority
+        self.report = None
+
+    def shards(self):
+        games = self.games
+        if games is None and self.top_games:
+            top = islice(self.client.iter_games_top(), self.top_games)
+            games = [_value(game, "id") for game in top]
+
+        languages = self.languages
+        if languages is None and games is None:
+            languages = LANGUAGES
+
+        shards = [()]
+        if games is not None:
+            shards = [
+                shard + (("game_id", game),) for shard in shards for game in games
+            ]
+        if languages is not None:
+            shards = [
+                shard + (("language", language),)
+                for shard in shards
+                for language in languages
+            ]
+        return list(dict.fromkeys(shards))
+
+    def _run(self, shard, kwargs, results, stop):
+        def put(item):
+            while not stop.is_set():
+                try:
+                    results.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        if stop.is_set():
+            return
+
+        priority = self.priority
+        context = nullcontext() if priority is None else self.client.priority(priority)
+        try:
+            with context:
+                pages = iter_pages(
+                    self.client.get_streams, **dict(kwargs, **dict(shard))
+                )
+                for page in pages:
+                    if not put((shard, page)):
+                        return
+            put((shard, _DONE))
+        except Exception as error:
+            put((shard, error))
+
+    def crawl(self, **kwargs):
+        shards = self.shards()
+        report = self.report = CrawlReport(shards)
+        seen = set()
+        results = queue.Queue(maxsize=self.max_workers * 2)
+        stop = threading.Event()
+
+        run = self.client._with_priority(self._run)
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        futures = []
+        try:
+            for shard in shards:
+                futures.append(executor.submit(run, shard, kwargs, results, stop))
+
+            remaining = len(shards)
+            while remaining:
+                shard, page = results.get()
+                if page is _DONE:
+                    report.done.add(shard)
+                    remaining -= 1
+                    continue
+                if isinstance(page, Exception):
+                    report.failed[shard] = page
+                    remaining -= 1
+                    continue
+
+                report.pages += 1
+                for stream in page.data:
+                    stream_id = _value(stream, "id")
+                    report.per_shard[shard] += 1
+                    if stream_id in seen:
+                        report.duplicates += 1
+                        continue
+                    seen.add(stream_id)
+                    report.streams += 1
+                    report.viewers += _value(stream, "viewer_count") or 0
+                    yield stream
+        finally:
+            stop.set()
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=True)
+            report.elapsed = time.monotonic() - report.started
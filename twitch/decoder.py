@@ -0,0 +1,116 @@
+import json
+
+from sys import intern
+
+from dataclasses import fields, is_dataclass
+from typing import TypeVar, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+loads = orjson.loads if orjson is not None else json.loads
+
+NoneType = type(None)
+
+_decoders = {}
+
+
+def _unwrap(annotation):
+    if getattr(annotation, "__origin__", None) is Union:
+        args = [arg for arg in annotation.__args__ if arg is not NoneType]
+        if len(args) == 1:
+            return args[0], True
+    return annotation, False
+
+
+def _list_item(annotation):
+    if getattr(annotation, "__origin__", None) is list:
+        args = getattr(annotation, "__args__", ())
+        if args and not isinstance(args[0], TypeVar):
+            return args[0]
+    return None
+
+
+def _converter(annotation):
+    annotation, _ = _unwrap(annotation)
+    if is_dataclass(annotation):
+        return compile_decoder(annotation)
+
+    item = _list_item(annotation)
+    if item is not None:
+        convert = _converter(item)
+        if convert is not None:
+            return lambda values: [convert(value) for value in values]
+    return None
+
+
+def _field_expression(field, index, namespace, intern_fields, field_keys):
+    annotation, optional = _unwrap(field.type)
+    value = f"data.get({field.name!r})" if optional else f"data[{field.name!r}]"
+    if field.name in intern_fields:
+        return f"_intern({value})"
+    if field.name in field_keys:
+        namespace[f"_keys{index}"] = field_keys[field.name]
+        return f"_pick({value}, _keys{index})"
+
+    item = _list_item(annotation)
+    if item is not None and not optional:
+        convert = _converter(item)
+        if convert is None:
+            return value
+        namespace[f"_item{index}"] = convert
+        return f"[_item{index}(item) for item in {value}]"
+
+    convert = _converter(annotation)
+    if convert is None:
+        return value
+    namespace[f"_field{index}"] = convert
+    if optional:
+        return f"_optional(_field{index}, {value})"
+    return f"_field{index}({value})"
+
+
+def _optional(convert, value):
+    return None if value is None else convert(value)
+
+
+def _pick(value, keys):
+    if value is None:
+        return None
+    return {key: value[key] for key in keys if key in value}
+
+
+def _intern(value):
+    if type(value) is str:
+        return intern(value)
+    if type(value) is list:
+        return [intern(item) if type(item) is str else item for item in value]
+    return value
+
+
+def compile_decoder(model):
+    decoder = _decoders.get(model)
+    if decoder is not None:
+        return decoder
+
+    namespace = {
+        "_model": model,
+        "_optional": _optional,
+        "_intern": _intern,
+        "_pick": _pick,
+    }
+    intern_fields = getattr(model, "_intern_fields", frozenset())
+    field_keys = getattr(model, "_field_keys", {})
+    arguments = ",\n        ".join(
+        _field_expression(field, index, namespace, intern_fields, field_keys)
+        for index, field in enumerate(fields(model))
+        if field.init
+    )
+    source = f"def decode(data):\n    return _model(\n        {arguments}\n    )\n"
+    exec(compile(source, f"<decoder {model.__qualname__}>", "exec"), namespace)
+
+    decoder = _decoders[model] = namespace["decode"]
+    decoder.source = source
+    return decoder
@@ -0,0 +1,323 @@
+import calendar
+import hashlib
+import hmac
+import queue
+import threading
+import time
+import traceback
+
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+
+from .decoder import compile_decoder, loads
+from .models import (
+    ChannelFollowEventModel,
+    ChannelUpdateEventModel,
+    StreamOfflineEventModel,
+    StreamOnlineEventModel,
+)
+
+MESSAGE_ID = "twitch-eventsub-message-id"
+MESSAGE_TIMESTAMP = "twitch-eventsub-message-timestamp"
+MESSAGE_SIGNATURE = "twitch-eventsub-message-signature"
+MESSAGE_TYPE = "twitch-eventsub-message-type"
+
+HEADERS = (MESSAGE_ID, MESSAGE_TIMESTAMP, MESSAGE_SIGNATURE, MESSAGE_TYPE)
+
+NOTIFICATION = "notification"
+VERIFICATION = "webhook_callback_verification"
+REVOCATION = "revocation"
+
+EVENT_MODELS = {
+    "stream.online": StreamOnlineEventModel,
+    "stream.offline": StreamOfflineEventModel,
+    "channel.update": ChannelUpdateEventModel,
+    "channel.follow": ChannelFollowEventModel,
+}
+
+_STOP = object()
+
+
+@dataclass
+class EventSubMessage:
+    message_id: str
+    message_type: str
+    timestamp: str
+    subscription_type: Optional[str]
+    subscription_version: Optional[str]
+    subscription: dict
+    event: Any
+
+
+def sign(secret, message_id, timestamp, body):
+    if isinstance(secret, str):
+        secret = secret.encode()
+    message = message_id.encode() + timestamp.encode() + body
+    return "sha256=" + hmac.new(secret, message, hashlib.sha256).hexdigest()
+
+
+def _parse_timestamp(value):
+    value, _, fraction = value.rstrip("Z").partition(".")
+    seconds = calendar.timegm(time.strptime(value, "%Y-%m-%dT%H:%M:%S"))
+    return seconds + float(f"0.{fraction}") if fraction else seconds
+
+
+def _response(status, body=b"", content_type="text/plain"):
+    return status, content_type, body
+
+
+class EventSubReceiver:
+    def __init__(
+        self,
+        secret,
+        queue_size=10000,
+        workers=1,
+        dedupe_size=100000,
+        max_age=600.0,
+        on_error=None,
+    ):
+        self.secret = secret.encode() if isinstance(secret, str) else secret
+        self.workers = workers
+        self.dedupe_size = dedupe_size
+        self.max_age = max_age
+        self.on_error = on_error
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.stats = {
+            "received": 0,
+            "verified": 0,
+            "duplicates": 0,
+            "rejected": 0,
+            "dropped": 0,
+            "handled": 0,
+            "errors": 0,
+        }
+        self._handlers = defaultdict(list)
+        self._seen = OrderedDict()
+        self._lock = threading.Lock()
+        self._threads = []
+
+    def on(self, subscription_type):
+        def register(handler):
+            self._handlers[subscription_type].append(handler)
+            return handler
+
+        return register
+
+    def on_revocation(self, handler):
+        self._handlers[REVOCATION].append(handler)
+        return handler
+
+    def start(self):
+        with self._lock:
+            if self._threads:
+                return
+            for _ in range(self.workers):
+                thread = threading.Thread(target=self._work, daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self):
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for _ in threads:
+            self.queue.put(_STOP)
+        for thread in threads:
+            thread.join()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def _first_delivery(self, message_id, now):
+        seen = self._seen
+        with self._lock:
+            if message_id in seen:
+                return False
+            seen[message_id] = now
+            while seen and (
+                len(seen) > self.dedupe_size
+                or next(iter(seen.values())) < now - self.max_age
+            ):
+                seen.popitem(last=False)
+            return True
+
+    def _forget(self, message_id):
+        with self._lock:
+            self._seen.pop(message_id, None)
+
+    def process(self, headers, body):
+        self._count("received")
+        message_id = headers.get(MESSAGE_ID)
+        timestamp = headers.get(MESSAGE_TIMESTAMP)
+        signature = headers.get(MESSAGE_SIGNATURE)
+        message_type = headers.get(MESSAGE_TYPE)
+        if not (message_id and timestamp and signature and message_type):
+            self._count("rejected")
+            return _response(400, b"missing EventSub headers")
+
+        expected = sign(self.secret, message_id, timestamp, body)
+        if not hmac.compare_digest(expected, signature):
+            self._count("rejected")
+            return _response(403, b"invalid signature")
+
+        try:
+            age = time.time() - _parse_timestamp(timestamp)
+        except ValueError:
+            age = None
+        if age is None or age > self.max_age:
+            self._count("rejected")
+            return _response(403, b"stale message")
+
+        payload = loads(body)
+        if message_type == VERIFICATION:
+            self._count("verified")
+            return _response(200, payload["challenge"].encode())
+
+        if not self._first_delivery(message_id, time.monotonic()):
+            self._count("duplicates")
+            return _response(204)
+
+        subscription = payload.get("subscription") or {}
+        subscription_type = subscription.get("type")
+        event = payload.get("event")
+        model = EVENT_MODELS.get(subscription_type)
+        if model is not None and event is not None:
+            event = compile_decoder(model)(event)
+
+        message = EventSubMessage(
+            message_id=message_id,
+            message_type=message_type,
+            timestamp=timestamp,
+            subscription_type=subscription_type,
+            subscription_version=subscription.get("version"),
+            subscription=subscription,
+            event=event,
+        )
+        self.start()
+        try:
+            self.queue.put_nowait(message)
+        except queue.Full:
+            self._forget(message_id)
+            self._count("dropped")
+            return _response(503, b"receiver is overloaded")
+        return _response(204)
+
+    def _dispatch(self, message):
+        if message.message_type == REVOCATION:
+            handlers = self._handlers[REVOCATION]
+        else:
+            handlers = self._handlers[message.subscription_type] + self._handlers["*"]
+        for handler in handlers:
+            try:
+                handler(message)
+            except Exception as error:
+                self._count("errors")
+                if self.on_error is not None:
+                    self.on_error(message, error)
+                else:
+                    traceback.print_exc()
+        self._count("handled")
+
+    def _work(self):
+        while True:
+            message = self.queue.get()
+            try:
+                if message is _STOP:
+                    return
+                self._dispatch(message)
+            finally:
+                self.queue.task_done()
+
+    def join(self):
+        self.queue.join()
+
+    def __call__(self, environ, start_response):
+        headers = {
+            name: environ.get("HTTP_" + name.upper().replace("-", "_"))
+            for name in HEADERS
+        }
+        length = int(environ.get("CONTENT_LENGTH") or 0)
+        body = environ["wsgi.input"].read(length) if length else b""
+        status, content_type, content = self.process(headers, body)
+        start_response(
+            f"{status} {_REASONS[status]}",
+            [("Content-Type", content_type), ("Content-Length", str(len(content)))],
+        )
+        return [content]
+
+    async def asgi(self, scope, receive, send):
+        if scope["type"] != "http":
+            return
+
+        chunks = []
+        while True:
+            event = await receive()
+            chunks.append(event.get("body", b""))
+            if not event.get("more_body"):
+                break
+
+        headers = {}
+        for name, value in scope["headers"]:
+            name = name.decode("latin-1").lower()
+            if name in HEADERS:
+                headers[name] = value.decode("latin-1")
+        status, content_type, content = self.process(headers, b"".join(chunks))
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [
+                    (b"content-type", content_type.encode()),
+                    (b"content-length", str(len(content)).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": content})
+
+    def server(self, host="0.0.0.0", port=8080):
+        receiver = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                headers = {name: self.headers.get(name) for name in HEADERS}
+                status, content_type, content = receiver.process(headers, body)
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        return server
+
+    def serve(self, host="0.0.0.0", port=8080):
+        self.start()
+        with self.server(host, port) as server:
+            server.serve_forever()
+
+
+_REASONS = {
+    200: "OK",
+    204: "No Content",
+    400: "Bad Request",
+    403: "Forbidden",
+    503: "Service Unavailable",
+}
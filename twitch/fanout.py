@@ -0,0 +1,42 @@
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, wait
+
+_END = object()
+
+
+def _result(future, return_exceptions):
+    if return_exceptions:
+        error = future.exception()
+        if error is not None:
+            return error
+    return future.result()
+
+
+def fan_out(
+    executor, func, kwargs_iterable, window, ordered=True, return_exceptions=False
+):
+    kwargs_iterator = iter(kwargs_iterable)
+    pending = deque() if ordered else set()
+    submit = pending.append if ordered else pending.add
+
+    def fill():
+        while len(pending) < window:
+            kwargs = next(kwargs_iterator, _END)
+            if kwargs is _END:
+                return
+            submit(executor.submit(func, **kwargs))
+
+    try:
+        fill()
+        while pending:
+            if ordered:
+                done = (pending.popleft(),)
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                pending.difference_update(done)
+            fill()
+            for future in done:
+                yield _result(future, return_exceptions)
+    finally:
+        for future in pending:
+            future.cancel()
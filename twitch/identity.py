@@ -0,0 +1,168 @@
+import threading
+import time
+
+from collections import OrderedDict, namedtuple
+from dataclasses import fields, is_dataclass
+
+from .batch import iter_bulk
+
+Identity = namedtuple("Identity", ["id", "login", "display_name"])
+
+IDENTITY_FIELDS = (
+    ("id", "login", "display_name"),
+    ("id", "broadcaster_login", "display_name"),
+    ("user_id", "user_login", "user_name"),
+    ("from_id", "from_login", "from_name"),
+    ("to_id", "to_login", "to_name"),
+    ("broadcaster_id", "broadcaster_login", "broadcaster_name"),
+)
+
+_identity_fields = {}
+
+
+def _fields_of(cls):
+    triples = _identity_fields.get(cls)
+    if triples is None:
+        model = getattr(cls, "__model__", None) or cls
+        names = (
+            {field.name for field in fields(model)} if is_dataclass(model) else set()
+        )
+        triples = _identity_fields[cls] = tuple(
+            triple
+            for triple in IDENTITY_FIELDS
+            if triple[0] in names and triple[1] in names
+        )
+    return triples
+
+
+class IdentityResolver:
+    def __init__(self, client=None, maxsize=100000, negative_ttl=300.0):
+        self.client = client
+        self.maxsize = maxsize
+        self.negative_ttl = negative_ttl
+        self.hits = 0
+        self.misses = 0
+        self._by_id = OrderedDict()
+        self._by_login = {}
+        self._missing = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def add(self, user_id, login, display_name=None):
+        if not user_id or not login:
+            return
+        identity = Identity(user_id, login.lower(), display_name)
+        with self._lock:
+            self._store(identity)
+
+    def _store(self, identity):
+        previous = self._by_id.pop(identity.id, None)
+        if previous is not None and self._by_login.get(previous.login) == identity.id:
+            del self._by_login[previous.login]
+        if identity.display_name is None and previous is not None:
+            identity = identity._replace(display_name=previous.display_name)
+
+        self._by_id[identity.id] = identity
+        self._by_login[identity.login] = identity.id
+        self._missing.pop(("id", identity.id), None)
+        self._missing.pop(("login", identity.login), None)
+
+        while len(self._by_id) > self.maxsize:
+            _, evicted = self._by_id.popitem(last=False)
+            if self._by_login.get(evicted.login) == evicted.id:
+                del self._by_login[evicted.login]
+
+    def observe(self, page):
+        data = getattr(page, "data", None)
+        if not data:
+            return
+        triples = _fields_of(type(data[0]))
+        if not triples:
+            return
+
+        with self._lock:
+            for item in data:
+                for id_field, login_field, name_field in triples:
+                    user_id = getattr(item, id_field)
+                    login = getattr(item, login_field)
+                    if user_id and login:
+                        name = getattr(item, name_field, None)
+                        self._store(Identity(user_id, login.lower(), name))
+
+    def _lookup(self, key, value, now):
+        if key == "id":
+            identity = self._by_id.get(value)
+        else:
+            identity = self._by_id.get(self._by_login.get(value))
+        if identity is not None:
+            self._by_id.move_to_end(identity.id)
+            return identity, True
+
+        expires_at = self._missing.get((key, value))
+        if expires_at is not None:
+            if expires_at > now:
+                return None, True
+            del self._missing[(key, value)]
+        return None, False
+
+    def _resolve(self, key, values):
+        result = {}
+        misses = []
+        now = time.monotonic()
+        with self._lock:
+            for value in values:
+                identity, found = self._lookup(key, value, now)
+                if found:
+                    self.hits += 1
+                    result[value] = identity
+                else:
+                    self.misses += 1
+                    misses.append(value)
+
+        if misses:
+            users = iter_bulk(self.client.get_users, **{key: misses})
+            found = {}
+            for user in users:
+                identity = Identity(user.id, user.login.lower(), user.display_name)
+                found[identity.id if key == "id" else identity.login] = identity
+
+            expires_at = time.monotonic() + self.negative_ttl
+            with self._lock:
+                for value in misses:
+                    identity = found.get(value)
+                    if identity is not None:
+                        self._store(identity)
+                    else:
+                        self._missing[(key, value)] = expires_at
+                        while len(self._missing) > self.maxsize:
+                            self._missing.popitem(last=False)
+                    result[value] = identity
+        return result
+
+    def resolve_ids(self, ids):
+        return self._resolve("id", list(dict.fromkeys(ids)))
+
+    def resolve_logins(self, logins):
+        return self._resolve("login", list(dict.fromkeys(l.lower() for l in logins)))
+
+    def id(self, login):
+        identity = self.resolve_logins([login])[login.lower()]
+        return identity.id if identity is not None else None
+
+    def login(self, user_id):
+        identity = self.resolve_ids([user_id])[user_id]
+        return identity.login if identity is not None else None
+
+    def display_name(self, user_id):
+        identity = self.resolve_ids([user_id])[user_id]
+        return identity.display_name if identity is not None else None
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._by_id),
+            "missing": len(self._missing),
+        }
@@ -0,0 +1,154 @@
+import dataclasses
+
+from collections.abc import Sequence
+from dataclasses import fields, is_dataclass
+from typing import TypeVar
+
+from .compact import generated_name
+from .decoder import _unwrap, compile_decoder
+
+_models = {}
+
+
+class LazyList(Sequence):
+
+    __slots__ = ("_raw", "_items", "_view")
+
+    def __init__(self, raw, view):
+        self._raw = raw
+        self._items = [None] * len(raw)
+        self._view = view
+
+    def __len__(self):
+        return len(self._raw)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+
+        item = self._items[index]
+        if item is None:
+            item = self._items[index] = self._view(self._raw[index])
+        return item
+
+    def __iter__(self):
+        for index in range(len(self._raw)):
+            yield self[index]
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return repr(list(self))
+
+    def __reduce__(self):
+        return _restore_list, (self._view.__model__, self._raw)
+
+
+class LazyView:
+
+    __slots__ = ("_data", "_cache")
+
+    __model__ = None
+
+    def __init__(self, data):
+        self._data = data
+        self._cache = None
+
+    def __repr__(self):
+        values = ", ".join(
+            f"{field.name}={getattr(self, field.name)!r}"
+            for field in fields(self.__model__)
+        )
+        return f"{type(self).__qualname__}({values})"
+
+    def __eq__(self, other):
+        if isinstance(other, LazyView):
+            return self.__model__ is other.__model__ and self._data == other._data
+        return NotImplemented
+
+    def __reduce__(self):
+        return _restore, (self.__model__, self._data)
+
+    def materialize(self):
+        return compile_decoder(self.__model__)(self._data)
+
+
+def _restore(model, data):
+    return lazy_model(model)(data)
+
+
+def _restore_list(model, raw):
+    return LazyList(raw, lazy_model(model))
+
+
+def _plain(name):
+    return property(lambda self: self._data.get(name))
+
+
+def _nested(name, convert):
+    def get(self):
+        cache = self._cache
+        if cache is None:
+            cache = self._cache = {}
+        if name not in cache:
+            value = self._data.get(name)
+            cache[name] = None if value is None else convert(value)
+        return cache[name]
+
+    return property(get)
+
+
+def _field_property(field):
+    annotation, _ = _unwrap(field.type)
+    if is_dataclass(annotation):
+        return _nested(field.name, lazy_model(annotation))
+
+    if getattr(annotation, "__origin__", None) is list:
+        args = getattr(annotation, "__args__", ())
+        if args and not isinstance(args[0], TypeVar) and is_dataclass(args[0]):
+            view = lazy_model(args[0])
+            return _nested(field.name, lambda values: LazyList(values, view))
+    return _plain(field.name)
+
+
+def lazy_model(model):
+    lazy = _models.get(model)
+    if lazy is not None:
+        return lazy
+
+    name = generated_name("Lazy", model)
+    namespace = {
+        "__module__": __name__,
+        "__qualname__": name,
+        "__slots__": (),
+        "__model__": model,
+    }
+    for attribute, value in vars(model).items():
+        if is_dataclass(value) and isinstance(value, type):
+            namespace[attribute] = lazy_model(value)
+    for field in fields(model):
+        namespace[field.name] = _field_property(field)
+
+    lazy = _models[model] = type(name, (LazyView,), namespace)
+    return lazy
+
+
+def _raw(value):
+    if isinstance(value, LazyView):
+        return value._data
+    if isinstance(value, (list, LazyList)):
+        return [_raw(item) for item in value]
+    if is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    return value
+
+
+def replace(obj, **changes):
+    if not isinstance(obj, LazyView):
+        return dataclasses.replace(obj, **changes)
+
+    data = dict(obj._data)
+    for name, value in changes.items():
+        data[name] = _raw(value)
+    return type(obj)(data)
@@ -0,0 +1,247 @@
+import threading
+
+from bisect import bisect_left
+from time import perf_counter
+
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+PHASES = ("queue", "network", "decode", "total")
+
+
+class Sample:
+
+    __slots__ = (
+        "method",
+        "path",
+        "started",
+        "queue",
+        "network",
+        "decode",
+        "total",
+        "status_codes",
+        "bytes_in",
+        "bytes_out",
+        "records",
+        "retries",
+        "budget",
+        "cached",
+        "error",
+    )
+
+    def __init__(self, method, path):
+        self.method = method
+        self.path = path
+        self.started = perf_counter()
+        self.queue = self.network = self.decode = self.total = 0.0
+        self.status_codes = []
+        self.bytes_in = self.bytes_out = self.records = self.retries = 0
+        self.budget = None
+        self.cached = False
+        self.error = None
+
+    @property
+    def status_code(self):
+        return self.status_codes[-1] if self.status_codes else None
+
+    def __repr__(self):
+        return (
+            f"Sample({self.method} {self.path} {self.status_code}, "
+            f"total={self.total:.6f}, queue={self.queue:.6f}, "
+            f"network={self.network:.6f}, decode={self.decode:.6f})"
+        )
+
+
+class Histogram:
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        total = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            yield bound, total
+
+    def quantile(self, q):
+        if not self.count:
+            return None
+        rank = q * self.count
+        for bound, total in self.cumulative():
+            if total >= rank:
+                return bound
+
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+            "buckets": {str(bound): total for bound, total in self.cumulative()},
+        }
+
+
+class EndpointMetrics:
+    def __init__(self, buckets=BUCKETS):
+        self.latency = {phase: Histogram(buckets) for phase in PHASES}
+        self.requests = 0
+        self.errors = 0
+        self.cache_hits = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.records = 0
+        self.retries = 0
+        self.status_codes = {}
+        self.budget = None
+
+    def add(self, sample):
+        self.requests += 1
+        if sample.error is not None:
+            self.errors += 1
+        if sample.cached:
+            self.cache_hits += 1
+        else:
+            self.latency["queue"].observe(sample.queue)
+            self.latency["network"].observe(sample.network)
+        self.latency["decode"].observe(sample.decode)
+        self.latency["total"].observe(sample.total)
+        self.bytes_in += sample.bytes_in
+        self.bytes_out += sample.bytes_out
+        self.records += sample.records
+        self.retries += sample.retries
+        codes = self.status_codes
+        for status_code in sample.status_codes:
+            codes[status_code] = codes.get(status_code, 0) + 1
+        if sample.budget is not None:
+            self.budget = sample.budget
+
+    def as_dict(self):
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "cache_hits": self.cache_hits,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "records": self.records,
+            "retries": self.retries,
+            "status_codes": dict(self.status_codes),
+            "ratelimit_remaining": self.budget,
+            "latency": {
+                phase: histogram.as_dict() for phase, histogram in self.latency.items()
+            },
+        }
+
+
+def _labels(**labels):
+    pairs = ",".join(f'{key}="{value}"' for key, value in labels.items())
+    return "{" + pairs + "}"
+
+
+class Metrics:
+    def __init__(self, buckets=BUCKETS, namespace="twitch"):
+        self.buckets = tuple(buckets)
+        self.namespace = namespace
+        self.endpoints = {}
+        self.request_hooks = []
+        self.response_hooks = []
+        self._lock = threading.Lock()
+
+    def add_request_hook(self, hook):
+        self.request_hooks.append(hook)
+
+    def add_response_hook(self, hook):
+        self.response_hooks.append(hook)
+
+    def start(self, spec, kwargs):
+        sample = Sample(spec.method, spec.path)
+        for hook in self.request_hooks:
+            hook(spec, kwargs)
+        return sample
+
+    def finish(self, sample):
+        sample.total = perf_counter() - sample.started
+        key = (sample.method, sample.path)
+        with self._lock:
+            endpoint = self.endpoints.get(key)
+            if endpoint is None:
+                endpoint = self.endpoints[key] = EndpointMetrics(self.buckets)
+            endpoint.add(sample)
+        for hook in self.response_hooks:
+            hook(sample)
+
+    def reset(self):
+        with self._lock:
+            self.endpoints = {}
+
+    def as_dict(self):
+        with self._lock:
+            return {
+                f"{method} {path}": endpoint.as_dict()
+                for (method, path), endpoint in self.endpoints.items()
+            }
+
+    def prometheus(self):
+        name = self.namespace
+        latency, counters, statuses, budgets = [], [], [], []
+        totals = (
+            ("requests", "requests_total"),
+            ("errors", "errors_total"),
+            ("cache_hits", "cache_hits_total"),
+            ("bytes_in", "response_bytes_total"),
+            ("bytes_out", "request_bytes_total"),
+            ("records", "records_total"),
+            ("retries", "retries_total"),
+        )
+
+        with self._lock:
+            endpoints = sorted(self.endpoints.items())
+            for (method, path), endpoint in endpoints:
+                for phase, histogram in endpoint.latency.items():
+                    for bound, total in histogram.cumulative():
+                        le = "+Inf" if bound == float("inf") else repr(bound)
+                        labels = _labels(
+                            method=method, endpoint=path, phase=phase, le=le
+                        )
+                        latency.append(f"{name}_request_seconds_bucket{labels} {total}")
+                    labels = _labels(method=method, endpoint=path, phase=phase)
+                    latency.append(
+                        f"{name}_request_seconds_sum{labels} {histogram.sum}"
+                    )
+                    latency.append(
+                        f"{name}_request_seconds_count{labels} {histogram.count}"
+                    )
+
+                labels = _labels(method=method, endpoint=path)
+                for attribute, metric in totals:
+                    counters.append(
+                        (
+                            metric,
+                            f"{name}_{metric}{labels} {getattr(endpoint, attribute)}",
+                        )
+                    )
+                for status, count in sorted(endpoint.status_codes.items()):
+                    status_labels = _labels(method=method, endpoint=path, status=status)
+                    statuses.append(f"{name}_responses_total{status_labels} {count}")
+                if endpoint.budget is not None:
+                    budgets.append(
+                        f"{name}_ratelimit_remaining{labels} {endpoint.budget}"
+                    )
+
+        lines = [f"# TYPE {name}_request_seconds histogram"] + latency
+        for _, metric in totals:
+            lines.append(f"# TYPE {name}_{metric} counter")
+            lines.extend(line for key, line in counters if key == metric)
+        lines.append(f"# TYPE {name}_responses_total counter")
+        lines.extend(statuses)
+        lines.append(f"# TYPE {name}_ratelimit_remaining gauge")
+        lines.extend(budgets)
+        return "\n".join(lines) + "\n"
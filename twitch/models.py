@@ -326,3 +326,43 @@ class WebhooksSubscriptionsModel:
     total: Optional[int]
     data: List[Data]
     pagination: Pagination
+
+
+@dataclass
+class StreamOnlineEventModel:
+    id: Optional[str]
+    broadcaster_user_id: Optional[str]
+    broadcaster_user_login: Optional[str]
+    broadcaster_user_name: Optional[str]
+    type: Optional[str]
+    started_at: Optional[str]
+
+
+@dataclass
+class StreamOfflineEventModel:
+    broadcaster_user_id: Optional[str]
+    broadcaster_user_login: Optional[str]
+    broadcaster_user_name: Optional[str]
+
+
+@dataclass
+class ChannelUpdateEventModel:
+    broadcaster_user_id: Optional[str]
+    broadcaster_user_login: Optional[str]
+    broadcaster_user_name: Optional[str]
+    title: Optional[str]
+    language: Optional[str]
+    category_id: Optional[str]
+    category_name: Optional[str]
+    is_mature: Optional[bool]
+
+
+@dataclass
+class ChannelFollowEventModel:
+    user_id: Optional[str]
+    user_login: Optional[str]
+    user_name: Optional[str]
+    broadcaster_user_id: Optional[str]
+    broadcaster_user_login: Optional[str]
+    broadcaster_user_name: Optional[str]
+    followed_at: Optional[str]
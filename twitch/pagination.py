@@ -0,0 +1,95 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from types import MethodType
+
+
+def _cursor(page):
+    if isinstance(page, dict):
+        return (page.get("pagination") or {}).get("cursor") if page["data"] else None
+    if not page.data:
+        return None
+    return getattr(getattr(page, "pagination", None), "cursor", None)
+
+
+def _pages(fetch, kwargs):
+    page = fetch(**kwargs)
+    while True:
+        yield page
+        cursor = _cursor(page)
+        if not cursor:
+            return
+        page = fetch(**dict(kwargs, after=cursor))
+
+
+def _prefetched_pages(fetch, kwargs):
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(fetch, **kwargs)
+        while future is not None:
+            page = future.result()
+            cursor = _cursor(page)
+            if cursor:
+                future = executor.submit(fetch, **dict(kwargs, after=cursor))
+            else:
+                future = None
+            try:
+                yield page
+            except GeneratorExit:
+                if future is not None:
+                    future.cancel()
+                raise
+
+
+def iter_pages(method, prefetch=False, raw=False, **kwargs):
+    params = method.spec.params
+    first = params.get("first")
+    if first is not None and first.maximum and "first" not in kwargs:
+        kwargs["first"] = first.maximum
+    if "after" in params:
+        kwargs.setdefault("after", None)
+
+    fetch = partial(method.__self__.raw, method) if raw else method
+    if prefetch:
+        return _prefetched_pages(method.__self__._with_priority(fetch), kwargs)
+    return _pages(fetch, kwargs)
+
+
+def _iter_pages(method, checkpoint, **kwargs):
+    if checkpoint is None:
+        return iter_pages(method, **kwargs)
+
+    from .checkpoint import checkpointed_pages
+
+    return checkpointed_pages(method, checkpoint, **kwargs)
+
+
+def paginate(
+    method, prefetch=False, columnar=False, columns=None, checkpoint=None, **kwargs
+):
+    if columnar:
+        from .columnar import build_columns
+
+        fields = kwargs.pop("fields", None)
+        if columns is None and fields is not None:
+            columns = [fields] if isinstance(fields, str) else fields
+
+        pages = _iter_pages(method, checkpoint, prefetch=prefetch, raw=True, **kwargs)
+        for page in pages:
+            yield build_columns(method.spec.model, page["data"], columns)
+        return
+
+    for page in _iter_pages(method, checkpoint, prefetch=prefetch, **kwargs):
+        yield from page.data
+
+
+def paginated(func):
+    def _iter(client, prefetch=False, columnar=False, columns=None, **kwargs):
+        return paginate(
+            MethodType(func, client),
+            prefetch=prefetch,
+            columnar=columnar,
+            columns=columns,
+            **kwargs,
+        )
+
+    _iter.paginates = func
+    return _iter
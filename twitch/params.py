@@ -14,6 +14,7 @@ class BaseParam:
         maximum=None,
         data_format=None,
         required_set=None,
+        max_items=None,
     ):
         self.name = name
         self.types = types
@@ -22,13 +23,14 @@ class BaseParam:
         self.maximum = maximum
         self.data_format = data_format
         self.required_set = required_set
+        self.max_items = max_items
 
     def validate(self, value):
 
         if value and not isinstance(value, getattr(self.types, "__args__", self.types)):
             raise ValidationError(message=f"{self.name} must be {self.types}")
 
-        if self.required & (value is None):
+        if self.required and self.required_set is None and value is None:
             raise ValidationError(message=f"{self.name} is required")
 
         if getattr(self, "minimum", None) and (value and value < self.minimum):
@@ -40,3 +42,8 @@ class BaseParam:
             raise ValidationError(
                 message=f"{self.name} must be lower than {getattr(self, 'maximum')}"
             )
+
+        if self.max_items and isinstance(value, list) and len(value) > self.max_items:
+            raise ValidationError(
+                message=f"{self.name} must have at most {self.max_items} items"
+            )
@@ -0,0 +1,128 @@
+from dataclasses import dataclass, fields as model_fields, is_dataclass
+from typing import List, Optional
+
+from .compact import INTERN_FIELDS, _reduce, generated_name
+from .decoder import _unwrap
+from .exception import ValidationError
+
+_models = {}
+
+
+def parse_fields(fields):
+    if isinstance(fields, str):
+        fields = fields.split(",")
+
+    tree = {}
+    for path in fields:
+        node = tree
+        for part in path.strip().split("."):
+            node = node.setdefault(part, {})
+    return _freeze(tree)
+
+
+def _freeze(tree):
+    return tuple((name, _freeze(children)) for name, children in tree.items())
+
+
+def _project_type(cls, name, annotation, children, frozen, intern, keys):
+    if not children:
+        return annotation
+
+    inner, optional = _unwrap(annotation)
+    if is_dataclass(inner):
+        projected = _narrow(inner, children, frozen, intern)
+    elif getattr(inner, "__origin__", None) is list and is_dataclass(inner.__args__[0]):
+        projected = List[_narrow(inner.__args__[0], children, frozen, intern)]
+    elif inner is dict:
+        if any(grandchildren for _, grandchildren in children):
+            raise ValidationError(
+                message=f"{cls.__qualname__}.{name} can only be projected one level deep"
+            )
+        keys[name] = tuple(key for key, _ in children)
+        return annotation
+    else:
+        raise ValidationError(
+            message=f"{cls.__qualname__}.{name} has no fields to project"
+        )
+    return Optional[projected] if optional else projected
+
+
+def _narrow(cls, tree, frozen, intern):
+    key = (cls, tree, frozen, intern)
+    narrow = _models.get(key)
+    if narrow is not None:
+        return narrow
+
+    available = {field.name: field for field in model_fields(cls)}
+    qualname = generated_name("Projected", cls)
+    namespace = {
+        "__module__": __name__,
+        "__qualname__": qualname,
+        "__annotations__": {},
+        "__reduce__": _reduce,
+        "_factory": (_narrow, key),
+    }
+    keys = {}
+    for name, children in tree:
+        field = available.get(name)
+        if field is None:
+            raise ValidationError(
+                message=f"{name} is not a field of {cls.__qualname__}"
+            )
+        annotation = _project_type(
+            cls, name, field.type, children, frozen, intern, keys
+        )
+        namespace["__annotations__"][name] = annotation
+        nested = _unwrap(annotation)[0]
+        nested = getattr(nested, "__args__", (nested,))[0]
+        source = _unwrap(field.type)[0]
+        source = getattr(source, "__args__", (source,))[0]
+        if is_dataclass(nested) and vars(cls).get(source.__name__) is source:
+            namespace[source.__name__] = nested
+
+    names = tuple(namespace["__annotations__"])
+    namespace["__slots__"] = names
+    namespace["_intern_fields"] = (
+        INTERN_FIELDS & frozenset(names) if intern else frozenset()
+    )
+    namespace["_field_keys"] = keys
+
+    narrow = dataclass(frozen=frozen)(type(qualname, (), namespace))
+    _models[key] = narrow
+    return narrow
+
+
+def project_model(model, fields, frozen=False, intern=False):
+    return _project(model, parse_fields(fields), frozen, intern)
+
+
+def _project(model, tree, frozen, intern):
+    data = getattr(model, "Data", None)
+    names = {field.name for field in model_fields(model)}
+    if not is_dataclass(data) or "data" not in names:
+        return _narrow(model, tree, frozen, intern)
+
+    key = ("page", model, tree, frozen, intern)
+    projected = _models.get(key)
+    if projected is not None:
+        return projected
+
+    narrow = _narrow(data, tree, frozen, intern)
+    qualname = generated_name("Projected", model)
+    namespace = {
+        "__module__": __name__,
+        "__qualname__": qualname,
+        "__annotations__": {},
+        "__reduce__": _reduce,
+        "_factory": (_project, (model, tree, frozen, intern)),
+        "Data": narrow,
+    }
+    for field in model_fields(model):
+        namespace["__annotations__"][field.name] = (
+            List[narrow] if field.name == "data" else field.type
+        )
+    namespace["__slots__"] = tuple(namespace["__annotations__"])
+
+    projected = dataclass(frozen=frozen)(type(qualname, (), namespace))
+    _models[key] = projected
+    return projected
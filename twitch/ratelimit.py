@@ -0,0 +1,105 @@
+import heapq
+import itertools
+import threading
+import time
+
+from contextlib import contextmanager
+
+INTERACTIVE = 0
+NORMAL = 5
+BACKGROUND = 10
+
+
+class RateLimiter:
+    def __init__(self, limit=800, period=60.0, max_replays=2):
+        self.limit = limit
+        self.period = period
+        self.max_replays = max_replays
+        self.tokens = float(limit)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._in_flight = 0
+        self._probed = False
+        self._queue = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._local = threading.local()
+
+    @contextmanager
+    def priority(self, priority):
+        previous = getattr(self._local, "priority", NORMAL)
+        self._local.priority = priority
+        try:
+            yield
+        finally:
+            self._local.priority = previous
+
+    def bind(self, func):
+        priority = getattr(self._local, "priority", None)
+        if priority is None:
+            return func
+
+        def bound(*args, **kwargs):
+            with self.priority(priority):
+                return func(*args, **kwargs)
+
+        return bound
+
+    def _refill(self, now):
+        rate = self.limit / self.period
+        self.tokens = min(self.limit, self.tokens + (now - self._updated) * rate)
+        self._updated = now
+
+    def _delay(self, now):
+        rate = self.limit / self.period
+        return max(self._blocked_until - now, (1 - self.tokens) / rate, 0.001)
+
+    def acquire(self, priority=None):
+        if priority is None:
+            priority = getattr(self._local, "priority", NORMAL)
+        ticket = (priority, next(self._sequence))
+
+        with self._condition:
+            heapq.heappush(self._queue, ticket)
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    if self._queue[0] == ticket:
+                        ready = self._probed or self._in_flight == 0
+                        if ready and self.tokens >= 1 and now >= self._blocked_until:
+                            heapq.heappop(self._queue)
+                            self.tokens -= 1
+                            self._in_flight += 1
+                            return
+                        self._condition.wait(self._delay(now))
+                    else:
+                        self._condition.wait()
+            except BaseException:
+                if ticket in self._queue:
+                    self._queue.remove(ticket)
+                    heapq.heapify(self._queue)
+                raise
+            finally:
+                self._condition.notify_all()
+
+    def update(self, headers=None, status_code=None):
+        with self._condition:
+            self._in_flight = max(self._in_flight - 1, 0)
+            self._probed = True
+            limit = headers.get("Ratelimit-Limit") if headers else None
+            remaining = headers.get("Ratelimit-Remaining") if headers else None
+            reset = headers.get("Ratelimit-Reset") if headers else None
+
+            now = time.monotonic()
+            self._refill(now)
+            if limit is not None:
+                self.limit = int(limit)
+            if remaining is not None:
+                budget = max(int(remaining) - self._in_flight, 0)
+                self.tokens = min(self.tokens, self.limit, budget)
+            if status_code == 429:
+                self.tokens = 0
+                wait = float(reset) - time.time() if reset is not None else 1.0
+                self._blocked_until = max(self._blocked_until, now + max(wait, 0))
+            self._condition.notify_all()
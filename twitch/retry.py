@@ -0,0 +1,55 @@
+import random
+import time
+
+
+class RetryPolicy:
+    def __init__(
+        self,
+        retries=3,
+        backoff=0.5,
+        max_backoff=30.0,
+        max_elapsed=60.0,
+        connect_timeout=3.05,
+        read_timeout=10.0,
+        statuses=(500, 502, 503, 504),
+        methods=("GET", "HEAD", "OPTIONS", "PUT", "DELETE"),
+        hook=None,
+    ):
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_elapsed = max_elapsed
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.statuses = set(statuses)
+        self.methods = {method.upper() for method in methods}
+        self.hook = hook
+
+    @property
+    def timeout(self):
+        return self.connect_timeout, self.read_timeout
+
+    def delay(self, attempt):
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+
+    def wait(self, path, method, attempt, started, response=None, error=None):
+        if method.upper() not in self.methods or attempt >= self.retries:
+            return False
+        if response is not None and response.status_code not in self.statuses:
+            return False
+
+        delay = self.delay(attempt)
+        if time.monotonic() - started + delay > self.max_elapsed:
+            return False
+
+        if self.hook is not None:
+            self.hook(
+                path=path,
+                method=method,
+                attempt=attempt + 1,
+                delay=delay,
+                status_code=getattr(response, "status_code", None),
+                error=error,
+            )
+        time.sleep(delay)
+        return True
@@ -0,0 +1,68 @@
+from collections import namedtuple
+
+StreamEvent = namedtuple("StreamEvent", ["kind", "id", "stream", "previous", "changes"])
+
+STARTED = "started"
+ENDED = "ended"
+CHANGED = "changed"
+
+
+def _value(item, name):
+    if isinstance(item, dict):
+        return item.get(name)
+    return getattr(item, name, None)
+
+
+class StreamTracker:
+    def __init__(self, client=None, fields=("title", "game_id", "viewer_count")):
+        self.client = client
+        self.fields = tuple(fields)
+        self.sweeps = 0
+        self._index = {}
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, stream_id):
+        return stream_id in self._index
+
+    def state(self, stream_id):
+        values = self._index.get(stream_id)
+        return dict(zip(self.fields, values)) if values is not None else None
+
+    def sweep(self, streams=None, **kwargs):
+        if streams is None:
+            streams = self.client.iter_streams(**kwargs)
+
+        fields = self.fields
+        previous = self._index
+        current = {}
+        try:
+            for stream in streams:
+                stream_id = _value(stream, "id")
+                if stream_id in current:
+                    continue
+                values = tuple(_value(stream, name) for name in fields)
+                current[stream_id] = values
+
+                old = previous.pop(stream_id, None)
+                if old is None:
+                    yield StreamEvent(STARTED, stream_id, stream, None, {})
+                elif old != values:
+                    changes = {
+                        name: (before, after)
+                        for name, before, after in zip(fields, old, values)
+                        if before != after
+                    }
+                    yield StreamEvent(
+                        CHANGED, stream_id, stream, dict(zip(fields, old)), changes
+                    )
+        except BaseException:
+            previous.update(current)
+            raise
+
+        self._index = current
+        self.sweeps += 1
+        while previous:
+            stream_id, values = previous.popitem()
+            yield StreamEvent(ENDED, stream_id, None, dict(zip(fields, values)), {})
@@ -0,0 +1,131 @@
+from collections import defaultdict
+from dataclasses import is_dataclass
+from types import MappingProxyType
+from urllib.parse import urljoin
+
+from .compact import compact_model
+from .decoder import compile_decoder, loads
+from .exception import APIError, ValidationError
+from .lazy import lazy_model
+from .projection import project_model
+from .params import BaseParam
+
+
+def compile_validator(params):
+    names = frozenset(params)
+    checks = tuple(params.items())
+
+    groups = defaultdict(set)
+    for name, param in params.items():
+        groups[param.required_set].add(name)
+    required_sets = tuple((key, frozenset(group)) for key, group in groups.items())
+
+    def validate(kwargs):
+        for key, group in required_sets:
+            if group.isdisjoint(kwargs):
+                raise ValidationError(message=f"Some fields is required ({key})")
+
+        query_params = kwargs.keys() - names
+        if query_params:
+            raise ValidationError(
+                message=f"{list(query_params)} is not API query parameter.",
+            )
+
+        for name, param in checks:
+            param.validate(kwargs.get(name))
+
+    return validate, required_sets
+
+
+class EndpointSpec:
+
+    __slots__ = (
+        "path",
+        "method",
+        "model",
+        "oauth",
+        "cache_ttl",
+        "body",
+        "params",
+        "required_sets",
+        "validate",
+        "decoder",
+        "_decoders",
+        "_urls",
+    )
+
+    def __init__(
+        self,
+        path,
+        method="get",
+        model=None,
+        oauth=False,
+        cache_ttl=None,
+        body=False,
+        **config,
+    ):
+        params = {
+            item.name: item for item in config.values() if isinstance(item, BaseParam)
+        }
+        validate, required_sets = compile_validator(params)
+
+        setattr_ = super().__setattr__
+        setattr_("path", path)
+        setattr_("method", method.upper())
+        setattr_("model", model)
+        setattr_("oauth", oauth)
+        setattr_("cache_ttl", cache_ttl)
+        setattr_("body", body)
+        setattr_("params", MappingProxyType(params))
+        setattr_("required_sets", required_sets)
+        setattr_("validate", validate)
+        setattr_("decoder", compile_decoder(model) if is_dataclass(model) else None)
+        setattr_("_decoders", {})
+        setattr_("_urls", {})
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __repr__(self):
+        return f"EndpointSpec({self.method} {self.path})"
+
+    def url(self, base):
+        url = self._urls.get(base)
+        if url is None:
+            url = self._urls[base] = urljoin(base, self.path)
+        return url
+
+    def decoder_for(self, compact=False, frozen=False, lazy=False, fields=None):
+        if self.decoder is None:
+            return None
+        if fields is not None:
+            if not isinstance(fields, (str, tuple)):
+                fields = tuple(fields)
+            key = (fields, compact, frozen)
+            decoder = self._decoders.get(key)
+            if decoder is None:
+                model = project_model(self.model, fields, frozen=frozen, intern=compact)
+                decoder = self._decoders[key] = compile_decoder(model)
+            return decoder
+        if lazy:
+            return lazy_model(self.model)
+        if not compact:
+            return self.decoder
+
+        decoder = self._decoders.get(frozen)
+        if decoder is None:
+            model = compact_model(self.model, frozen=frozen)
+            decoder = self._decoders[frozen] = compile_decoder(model)
+        return decoder
+
+    def decode(self, content, compact=False, frozen=False, lazy=False, fields=None):
+        decoder = self.decoder_for(compact, frozen, lazy, fields)
+        if decoder is not None:
+            try:
+                return decoder(loads(content))
+            except Exception:
+                if isinstance(content, bytes):
+                    content = content.decode("utf-8", "replace")
+                raise APIError(message=content)
+        else:
+            return loads(content)
@@ -0,0 +1,151 @@
+import json
+import threading
+
+from urllib.parse import urlparse
+
+import requests
+
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+
+class RequestsTransport:
+    def __init__(self, max_connections=16, pool_block=True, session=None):
+        self.max_connections = max_connections
+        self.session = session if session is not None else requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=max_connections, pool_block=pool_block)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def request(self, method, url, params=None, headers=None, timeout=None, json=None):
+        return self.session.request(
+            method, url, params=params, headers=headers, timeout=timeout, json=json
+        )
+
+    def close(self):
+        self.session.close()
+
+
+class HTTP2Transport:
+    def __init__(self, max_connections=1, max_keepalive_connections=None):
+        try:
+            import httpx
+        except ImportError:
+            raise ImportError(
+                "HTTP2Transport requires httpx, install py-twitch[http2]"
+            ) from None
+
+        self._httpx = httpx
+        self.max_connections = max_connections
+        self.client = httpx.Client(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+            ),
+        )
+
+    def _timeout(self, timeout):
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            return self._httpx.Timeout(read, connect=connect)
+        return timeout
+
+    def request(self, method, url, params=None, headers=None, timeout=None, json=None):
+        httpx = self._httpx
+        if params:
+            params = {key: value for key, value in params.items() if value is not None}
+        try:
+            return self.client.request(
+                method,
+                url,
+                params=params,
+                headers=headers,
+                json=json,
+                timeout=self._timeout(timeout),
+            )
+        except httpx.TimeoutException as error:
+            raise requests.Timeout(str(error)) from error
+        except httpx.TransportError as error:
+            raise requests.ConnectionError(str(error)) from error
+
+    def close(self):
+        self.client.close()
+
+
+class MemoryResponse:
+
+    __slots__ = ("status_code", "headers", "content", "request")
+
+    def __init__(self, status_code=200, content=b"", headers=None):
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers or {})
+        self.content = content
+        self.request = None
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8", "replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+
+def _response(result):
+    if isinstance(result, MemoryResponse):
+        return result
+    status_code, body, headers = (result + (None,))[:3]
+    if not isinstance(body, bytes):
+        body = body.encode() if isinstance(body, str) else json.dumps(body).encode()
+    return MemoryResponse(status_code, body, headers)
+
+
+class MemoryTransport:
+    def __init__(self, handler=None, record=False):
+        self.handler = handler
+        self.record = record
+        self.routes = {}
+        self.requests = []
+        self.calls = 0
+        self._paths = {}
+        self._lock = threading.Lock()
+
+    def add(self, method, path, body, status_code=200, headers=None):
+        if not callable(body):
+            body = _response((status_code, body, headers))
+        self.routes[(method.upper(), path.strip("/"))] = (status_code, body, headers)
+        self._paths.clear()
+
+    def _route(self, method, url):
+        key = (method, url.split("?", 1)[0])
+        route = self._paths.get(key)
+        if route is None:
+            parts = urlparse(url).path.strip("/").split("/")
+            for index in range(len(parts)):
+                route = self.routes.get((method, "/".join(parts[index:])))
+                if route is not None:
+                    self._paths[key] = route
+                    break
+        return route
+
+    def request(self, method, url, params=None, headers=None, timeout=None, json=None):
+        if json is not None:
+            params = json
+        with self._lock:
+            self.calls += 1
+            if self.record:
+                self.requests.append((method, url, params))
+
+        if self.handler is not None:
+            return _response(self.handler(method, url, params))
+
+        route = self._route(method.upper(), url)
+        if route is None:
+            return MemoryResponse(404, b'{"error": "Not Found", "status": 404}')
+        status_code, body, headers = route
+        if callable(body):
+            return _response((status_code, body(params), headers))
+        return body
+
+    def close(self):
+        pass